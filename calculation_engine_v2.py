@@ -174,8 +174,9 @@ class FormulaEngineV2:
             alpha = self.v2_config.get('ewma_form', {}).get('alpha', 0.87)
             
             # Get recent points from database if not provided
-            recent_games = player_data.get('recent_points', [])
-            if not recent_games:
+            # Callers may preload recent_points (an empty list means "no form data", not "unknown")
+            recent_games = player_data.get('recent_points')
+            if recent_games is None:
                 recent_games = self._get_recent_points_from_db(player_data.get('player_id'))
             
             if not recent_games or len(recent_games) == 0:
@@ -0,0 +1,21 @@
+-- Player Metrics Update Performance
+-- Lineup uploads, manual overrides and recalculations rewrite starter_multiplier,
+-- true_value and the other multipliers for a whole gameweek at a time.
+-- Usage: Execute this SQL on fantrax_value_hunter database
+
+-- The (gameweek, player_id) lookup index used by every per-gameweek UPDATE.
+-- Already created by add_performance_indexes.sql - repeated here so fresh databases get it.
+-- starter_multiplier is intentionally NOT an INCLUDE column: indexing an updated column
+-- disables heap-only tuple (HOT) updates and would add an index write to every UPDATE.
+CREATE INDEX IF NOT EXISTS idx_player_metrics_gameweek_player
+ON player_metrics(gameweek, player_id);
+
+-- Leave 10% free space per page so updated rows can stay on the same page (HOT updates),
+-- avoiding index maintenance on the player_metrics indexes for multiplier changes.
+-- Applies to newly written pages; existing pages pick it up as the table is rewritten/vacuumed.
+ALTER TABLE player_metrics SET (fillfactor = 90);
+
+-- Verify settings
+SELECT relname, reloptions
+FROM pg_class
+WHERE relname = 'player_metrics';
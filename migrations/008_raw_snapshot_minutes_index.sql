@@ -0,0 +1,15 @@
+-- Form Import Lookup Performance
+-- import_form_data reads the previous gameweek's minutes_played for every uploaded player
+-- (raw_player_snapshots joined on player_id + gameweek) to decide games_played.
+-- Usage: Execute this SQL on fantrax_value_hunter database
+
+-- Covering index so that lookup is an index-only scan.
+-- Uniqueness of (player_id, gameweek) is already enforced by the table's UNIQUE constraint,
+-- so this stays a plain index rather than enforcing it a second time on every import.
+CREATE INDEX IF NOT EXISTS idx_raw_player_snapshots_player_gw_minutes
+ON raw_player_snapshots(player_id, gameweek) INCLUDE (minutes_played);
+
+-- Verify index
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'raw_player_snapshots';
@@ -0,0 +1,21 @@
+-- Name Mapping Monitoring Performance
+-- Indexes for the filtered queries behind /api/monitoring/metrics.
+-- Usage: Execute this SQL on fantrax_value_hunter database
+
+-- Recent activity: created_at >= CURRENT_DATE - INTERVAL '7 days'
+CREATE INDEX IF NOT EXISTS idx_name_mappings_created_at
+ON name_mappings(created_at DESC);
+
+-- Problem mappings: verified = false AND confidence_score < 70
+-- (extends the single-column idx_name_mappings_verified from 001_create_name_mappings.sql)
+CREATE INDEX IF NOT EXISTS idx_name_mappings_verified_confidence
+ON name_mappings(verified, confidence_score);
+
+-- source_system is already the leading column of idx_name_mappings_source.
+-- usage_count is intentionally NOT indexed: it is bumped on every matched import,
+-- and indexing it would disable HOT updates for those writes.
+
+-- Verify indexes
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'name_mappings';
@@ -0,0 +1,15 @@
+-- Player Name Lookup Performance
+-- Lineup imports look up every player's position by case-insensitive name + team
+-- (lookup_player_position: LOWER(name) = LOWER(%s) AND LOWER(team) = LOWER(%s)).
+-- Usage: Execute this SQL on fantrax_value_hunter database
+
+-- Expression index matching that predicate, so the lookup is an index scan rather
+-- than a sequential scan. text_pattern_ops also lets LIKE 'prefix%' on LOWER(name)
+-- use the index.
+CREATE INDEX IF NOT EXISTS idx_players_lower_name_team
+ON players(LOWER(name) text_pattern_ops, LOWER(team));
+
+-- Verify index
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'players';
@@ -22,7 +22,7 @@ if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
 # Import the Flask app from src/app.py
-from app import app
+from app import app, PG_POOL_MAXCONN
 
 def main():
     """Start the production server"""
@@ -32,7 +32,12 @@ def main():
     # Server configuration
     host = '0.0.0.0'  # Accept connections from any IP
     port = int(os.getenv('PORT', 5001))  # Use port 5001 by default
-    threads = 4  # Handle up to 4 concurrent requests
+    # One pooled connection per thread, plus one kept free for the background V2.0 recalculation
+    pool_threads = PG_POOL_MAXCONN - 1
+    threads = int(os.getenv('WAITRESS_THREADS', min(16, pool_threads)))
+    if threads > pool_threads:
+        print(f"Warning: WAITRESS_THREADS={threads} exceeds PG_POOL_MAXCONN-1={pool_threads}; "
+              "requests will queue for database connections")
     
     print(f"Server: Waitress WSGI Server")
     print(f"Host: {host}")
@@ -43,13 +48,13 @@ def main():
     
     # Test database connection before starting server
     try:
-        from app import get_db_connection
+        from app import get_db_connection, release_db_connection
         conn = get_db_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM players")
         player_count = cursor.fetchone()[0]
         print(f"Database connected: {player_count} players loaded")
-        conn.close()
+        release_db_connection(conn)
     except Exception as e:
         print(f"Database connection failed: {e}")
         print("Please check your database configuration and try again.")
@@ -3,17 +3,37 @@ Flask Backend for Fantrax Value Hunter Dashboard
 Provides API endpoints for parameter adjustment and True Value recalculation
 """
 
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Request, Response, request, jsonify, render_template, send_from_directory, stream_with_context, g, has_app_context
 from flask_cors import CORS
 from flask_caching import Cache
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
+import copy
+import csv
+import heapq
+import io
 import json
+import logging
+import numpy as np
+import orjson
 import os
-from typing import Dict, List, Optional, Any
+import pandas as pd
+from typing import Dict, List, Optional, Tuple, Any
 import time
 import sys
-from datetime import datetime
+import threading
+import weakref
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from itertools import chain
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+# DEBUG diagnostics in the import endpoints stay silent unless explicitly enabled
+logger.setLevel(logging.INFO)
 
 # Add name_matching module to path
 sys.path.append(os.path.dirname(__file__))
@@ -33,15 +53,28 @@ except ImportError:
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from calculation_engine_v2 import FormulaEngineV2
 
+# Unified gameweek detection (imported once rather than inside each endpoint)
+from src.gameweek_manager import GameweekManager
+
 # Add trend analysis engine
 from trend_analysis_engine import TrendAnalysisEngine
 
+class InMemoryUploadRequest(Request):
+    """Request that keeps uploaded files in memory rather than spooling them to a temp file"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # CSV uploads are small and bounded by MAX_CONTENT_LENGTH, so skip the tempfile round-trip
+        return io.BytesIO()
+
 # Configure Flask to serve React frontend
 frontend_build_dir = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'build')
 app = Flask(__name__, 
             template_folder='../templates',
             static_folder=frontend_build_dir,
             static_url_path='')
+app.request_class = InMemoryUploadRequest
+# Upper bound for request bodies (uploads are held in memory)
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 # Enable CORS with specific configuration
 CORS(app, resources={
     r"/api/*": {
@@ -80,30 +113,262 @@ if DATABASE_URL:
         'database': result.path[1:]  # Remove leading slash
     }
 
+# Connection pool sizing - amortizes connection setup across requests
+PG_POOL_MINCONN = int(os.getenv('PG_POOL_MINCONN', 4))
+PG_POOL_MAXCONN = int(os.getenv('PG_POOL_MAXCONN', 32))
+# How long a caller waits for a free pooled connection before giving up (seconds)
+PG_POOL_TIMEOUT = float(os.getenv('PG_POOL_TIMEOUT', 30))
+
+_pg_pool = None
+_pg_pool_lock = threading.Lock()
+# ThreadedConnectionPool.getconn raises PoolError when exhausted - callers take a slot
+# here first, so a full pool makes them wait instead of failing
+_pg_pool_slots = threading.BoundedSemaphore(PG_POOL_MAXCONN)
+
+def get_db_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    """Get the shared connection pool, creating it on first use"""
+    global _pg_pool
+    if _pg_pool is None:
+        with _pg_pool_lock:
+            if _pg_pool is None:
+                _pg_pool = psycopg2.pool.ThreadedConnectionPool(PG_POOL_MINCONN, PG_POOL_MAXCONN, **DB_CONFIG)
+    return _pg_pool
+
 def get_db_connection():
-    """Get database connection with error handling"""
+    """Get pooled database connection, waiting up to PG_POOL_TIMEOUT for a free one"""
+    if not _pg_pool_slots.acquire(timeout=PG_POOL_TIMEOUT):
+        logger.error("Database connection error: no pooled connection free after %ss", PG_POOL_TIMEOUT)
+        raise psycopg2.pool.PoolError(f"connection pool exhausted (waited {PG_POOL_TIMEOUT}s)")
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        return conn
+        conn = get_db_pool().getconn()
     except Exception as e:
-        print(f"Database connection error: {e}")
+        _pg_pool_slots.release()
+        logger.error("Database connection error: %s", e)
         raise
+    
+    # Track connections checked out during a request so teardown can return them
+    if has_app_context():
+        g.setdefault('db_connections', []).append(conn)
+    return conn
+
+def release_db_connection(conn):
+    """Return a connection to the pool (any open transaction is rolled back)"""
+    if has_app_context():
+        checked_out = g.get('db_connections')
+        if checked_out and conn in checked_out:
+            checked_out.remove(conn)
+    get_db_pool().putconn(conn)
+    _pg_pool_slots.release()
+
+@app.teardown_appcontext
+def release_request_connections(exception=None):
+    """Return any connections an endpoint did not release itself (e.g. on error paths)"""
+    for conn in g.pop('db_connections', []):
+        get_db_pool().putconn(conn)
+        _pg_pool_slots.release()
+
+# Server-side prepared statements for hot endpoints.
+# Each statement is PREPAREd lazily the first time it runs on a connection, so the
+# parse/plan cost is paid once per connection instead of on every request.
+PREPARED_STATEMENTS = {
+    'mo_upd': """
+        UPDATE player_metrics
+        SET starter_multiplier = $1,
+            true_value = (ppg / NULLIF(price, 0)) * form_multiplier * fixture_multiplier * $1
+        WHERE player_id = $2 AND gameweek = $3
+    """,
+    'mo_sel': """
+        SELECT pm.true_value, pm.starter_multiplier, p.name
+        FROM player_metrics pm
+        JOIN players p ON pm.player_id = p.id
+        WHERE pm.player_id = $1 AND pm.gameweek = $2
+    """,
+    'teams_sel': "SELECT DISTINCT team FROM players ORDER BY team",
+    'team_players_sel': """
+        SELECT id, name, team, position
+        FROM players
+        WHERE team = $1
+        ORDER BY name
+    """,
+    'player_count': "SELECT COUNT(*) FROM players",
+    'starter_dist': """
+        SELECT m.starter_multiplier, m.player_count, names.players
+        FROM (
+            SELECT starter_multiplier, COUNT(*) as player_count
+            FROM players
+            WHERE starter_multiplier IS NOT NULL
+            GROUP BY starter_multiplier
+        ) m
+        LEFT JOIN LATERAL (
+            -- Only the first 10 names per group are displayed
+            SELECT ARRAY_AGG(p.player_name ORDER BY p.player_name) as players
+            FROM (
+                SELECT player_name FROM players
+                WHERE starter_multiplier = m.starter_multiplier
+                ORDER BY player_name
+                LIMIT 10
+            ) p
+        ) names ON true
+        ORDER BY m.starter_multiplier DESC
+    """,
+    'starter_unusual': """
+        SELECT player_name, starter_multiplier, team, position
+        FROM players
+        WHERE starter_multiplier IS NOT NULL
+          AND starter_multiplier NOT IN (1.0, 0.65, 0.6, 0.0)
+        ORDER BY starter_multiplier DESC, player_name
+    """,
+    'starter_missing': """
+        SELECT COUNT(*) as missing_count
+        FROM players
+        WHERE starter_multiplier IS NULL
+    """,
+    # Lineup import: $1 default multiplier, $2/$3 parallel player_id/multiplier arrays, $4 gameweek
+    'lineup_upd': """
+        UPDATE player_metrics pm
+        SET starter_multiplier = COALESCE(v.mult, $1::numeric)
+        FROM (
+            SELECT base.player_id, ov.mult
+            FROM player_metrics base
+            LEFT JOIN unnest($2::text[], $3::numeric[]) AS ov(pid, mult) ON base.player_id = ov.pid
+            WHERE base.gameweek = $4
+        ) v
+        WHERE pm.player_id = v.player_id AND pm.gameweek = $4
+          AND pm.starter_multiplier IS DISTINCT FROM COALESCE(v.mult, $1::numeric)
+    """
+}
+
+# Statement names already prepared on each live connection
+_prepared_by_connection = weakref.WeakKeyDictionary()
+
+def execute_prepared(cursor, name: str, params: Optional[List] = None):
+    """Execute a named statement from PREPARED_STATEMENTS, preparing it on first use per connection"""
+    prepared = _prepared_by_connection.setdefault(cursor.connection, set())
+    if name not in prepared:
+        cursor.execute(f"PREPARE {name} AS {PREPARED_STATEMENTS[name]}")
+        prepared.add(name)
+    
+    if params:
+        placeholders = ', '.join(['%s'] * len(params))
+        cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+    else:
+        cursor.execute(f"EXECUTE {name}")
+
+def copy_into_temp_table(cursor, temp_table: str, like_table: str, columns: List[str], rows: List[tuple]):
+    """Bulk-load rows into a transaction-scoped staging copy of like_table's columns using COPY"""
+    # Only the copied columns, with no defaults or NOT NULL constraints - staged rows must not
+    # consume like_table's SERIAL sequence or trip constraints on columns the COPY never fills
+    column_list = ', '.join(columns)
+    cursor.execute(f"CREATE TEMP TABLE {temp_table} ON COMMIT DROP AS "
+                   f"SELECT {column_list} FROM {like_table} WITH NO DATA")
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {temp_table} ({column_list}) FROM STDIN WITH CSV", buffer)
+
+def _json_default(obj):
+    """orjson fallback for types it does not serialize natively (NUMERIC columns come back as Decimal)"""
+    if isinstance(obj, Decimal):
+        # Same wire format as jsonify, which serializes Decimal as a string
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def fast_json(obj, status: int = 200) -> Response:
+    """Serialize a large payload with orjson, bypassing jsonify (keys sorted as jsonify sorts them)"""
+    return Response(orjson.dumps(obj, default=_json_default,
+                                 option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS),
+                    status=status, mimetype='application/json')
+
+# One process-wide manager, so its 30 second current-gameweek cache survives across requests
+_gw_manager = GameweekManager()
+
+def get_gameweek_manager() -> GameweekManager:
+    """Get the shared GameweekManager"""
+    return _gw_manager
+
+# One process-wide name matcher, so names resolved by earlier imports/syncs are served from its
+# cache. confirm_mapping() evicts the confirmed name itself; bulk writes to name_mappings or
+# players outside the matcher call clear_cache()
+_name_matcher = UnifiedNameMatcher(DB_CONFIG)
+
+def get_name_matcher() -> UnifiedNameMatcher:
+    """Get the shared UnifiedNameMatcher"""
+    return _name_matcher
+
+def get_request_gameweek() -> int:
+    """Get the current gameweek, detected at most once per request"""
+    if not has_app_context():
+        return _gw_manager.get_current_gameweek()
+    if 'current_gameweek' not in g:
+        g.current_gameweek = get_gameweek_manager().get_current_gameweek()
+    return g.current_gameweek
+
+# Manual starter overrides live in their own small file so override edits don't rewrite the full config
+MANUAL_OVERRIDES_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'manual_overrides.json')
+
+def load_manual_overrides() -> Optional[Dict]:
+    """Load manual starter overrides, or None if they have not been split out of the main config yet"""
+    try:
+        with open(MANUAL_OVERRIDES_PATH, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error loading manual overrides: {e}")
+        return None
+
+def save_manual_overrides(overrides: Dict) -> bool:
+    """Save manual starter overrides without touching system_parameters.json"""
+    try:
+        with open(MANUAL_OVERRIDES_PATH, 'wb') as f:
+            f.write(orjson.dumps(overrides, option=orjson.OPT_INDENT_2))
+        return True
+    except Exception as e:
+        print(f"Error saving manual overrides: {e}")
+        return False
+
+SYSTEM_PARAMETERS_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'system_parameters.json')
+
+def _file_mtime(path: str) -> Optional[float]:
+    """Modification time of a file, or None if it doesn't exist"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+@lru_cache(maxsize=1)
+def _load_system_parameters_cached(params_mtime: Optional[float], overrides_mtime: Optional[float]) -> Dict:
+    """Parse the config files - cached until either file's mtime changes (errors propagate uncached)"""
+    with open(SYSTEM_PARAMETERS_PATH, 'r') as f:
+        parameters = json.load(f)
+    
+    overrides = load_manual_overrides()
+    if overrides is not None:
+        parameters.setdefault('starter_prediction', {})['manual_overrides'] = overrides
+    return parameters
 
 def load_system_parameters():
-    """Load system parameters from config file"""
-    config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'system_parameters.json')
+    """Load system parameters from config file (with manual overrides merged in)"""
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        parameters = _load_system_parameters_cached(_file_mtime(SYSTEM_PARAMETERS_PATH), _file_mtime(MANUAL_OVERRIDES_PATH))
     except Exception as e:
         print(f"Error loading system parameters: {e}")
         return {}
+    # Callers mutate and save the result, so hand out a private copy
+    return copy.deepcopy(parameters)
 
 def save_system_parameters(parameters: Dict):
-    """Save updated system parameters to config file"""
-    config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'system_parameters.json')
+    """Save updated system parameters to config file (manual overrides go to their own file)"""
+    starter_config = parameters.get('starter_prediction')
+    if isinstance(starter_config, dict) and 'manual_overrides' in starter_config:
+        if not save_manual_overrides(starter_config['manual_overrides']):
+            return False
+        parameters = {
+            **parameters,
+            'starter_prediction': {k: v for k, v in starter_config.items() if k != 'manual_overrides'}
+        }
     try:
-        with open(config_path, 'w') as f:
+        with open(SYSTEM_PARAMETERS_PATH, 'w') as f:
             json.dump(parameters, f, indent=2)
         return True
     except Exception as e:
@@ -179,7 +444,7 @@ def get_data_freshness_info(gameweek: int) -> Dict:
             'gameweek': gameweek
         }
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 def calculate_form_multiplier(player_id: str, current_gameweek: int, lookback_period: int = 3):
     """
@@ -241,7 +506,7 @@ def calculate_form_multiplier(player_id: str, current_gameweek: int, lookback_pe
         return 1.0
         
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 def calculate_fixture_difficulty_multiplier(team_code: str, position: str, gameweek: int, params: dict):
     """
@@ -295,7 +560,7 @@ def calculate_fixture_difficulty_multiplier(team_code: str, position: str, gamew
         print(f"Error calculating fixture difficulty for {team_code}: {e}")
         return 1.0
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 def calculate_fixture_difficulty_multiplier_cached(team_code: str, position: str, params: dict, fixture_cache: dict):
     """
@@ -344,16 +609,12 @@ def recalculate_true_values(gameweek: int = None):
     
     # Use GameweekManager if no gameweek specified
     if gameweek is None:
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        gameweek = gw_manager.get_current_gameweek()
+        gameweek = get_request_gameweek()
     
     params = load_system_parameters()
     
     # Use v2.0 calculation engine exclusively
     try:
-        from calculation_engine_v2 import FormulaEngineV2
-        
         # Initialize v2.0 engine
         v2_engine = FormulaEngineV2(DB_CONFIG, params)
         
@@ -490,7 +751,7 @@ def recalculate_true_values(gameweek: int = None):
         }
     finally:
         if 'conn' in locals():
-            conn.close()
+            release_db_connection(conn)
 
 @app.route('/')
 def dashboard():
@@ -535,9 +796,7 @@ def get_players():
     include_test = request.args.get('include_test', 'false').lower() == 'true'
     
     # Use GameweekManager for unified detection instead of hardcoded default
-    from src.gameweek_manager import GameweekManager
-    gw_manager = GameweekManager()
-    gameweek = gw_manager.get_current_gameweek()  # Main dashboard always shows current data
+    gameweek = get_request_gameweek()  # Main dashboard always shows current data
     
     limit = request.args.get('limit', 100, type=int)
     offset = request.args.get('offset', 0, type=int)
@@ -719,7 +978,7 @@ def get_players():
         
         elapsed_time = time.time() - start_time
         
-        return jsonify({
+        return fast_json({
             'players': players_list,
             'total_count': total_count,
             'filtered_count': len(players_list),
@@ -746,7 +1005,7 @@ def get_players():
                 'current_gameweek': gameweek,
                 'detection_method': 'GameweekManager',
                 'data_source': 'unified_detection',
-                'emergency_protection_active': gw_manager.get_system_status()['emergency_protection_active'],
+                'emergency_protection_active': get_gameweek_manager().get_system_status()['emergency_protection_active'],
                 'data_freshness': get_data_freshness_info(gameweek)
             }
         })
@@ -754,7 +1013,7 @@ def get_players():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 @app.route('/api/config', methods=['GET'])
 def get_config():
@@ -830,9 +1089,7 @@ def update_parameters():
         # Trigger True Value recalculation using GameweekManager for default
         gameweek = data.get('gameweek')
         if gameweek is None:
-            from src.gameweek_manager import GameweekManager
-            gw_manager = GameweekManager()
-            gameweek = gw_manager.get_current_gameweek()
+            gameweek = get_request_gameweek()
         recalc_result = recalculate_true_values(gameweek)
         
         if not recalc_result['success']:
@@ -895,9 +1152,7 @@ def update_system_parameters():
             return jsonify({'error': 'Failed to save parameters'}), 500
         
         # Trigger recalculation
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        gameweek = gw_manager.get_current_gameweek()
+        gameweek = get_request_gameweek()
         recalc_result = recalculate_true_values(gameweek)
         
         return jsonify({
@@ -924,9 +1179,7 @@ def manual_override():
         override_type = data.get('override_type')  # 'starter', 'bench', 'out', 'auto'
         
         # Get current gameweek using GameweekManager for consistency
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        gameweek = gw_manager.get_current_gameweek()
+        gameweek = get_request_gameweek()
         
         if not player_id or not override_type:
             return jsonify({'error': 'player_id and override_type required'}), 400
@@ -963,48 +1216,30 @@ def manual_override():
             rotation_penalty = params.get('starter_prediction', {}).get('auto_rotation_penalty', 0.65)
             multiplier = rotation_penalty
         
-        # Update player's starter multiplier
-        cursor.execute("""
-            UPDATE player_metrics 
-            SET starter_multiplier = %s
-            WHERE player_id = %s AND gameweek = %s
-        """, [multiplier, player_id, gameweek])
-        
-        # Recalculate True Value for this player
-        cursor.execute("""
-            UPDATE player_metrics 
-            SET true_value = (ppg / NULLIF(price, 0)) * form_multiplier * fixture_multiplier * starter_multiplier
-            WHERE player_id = %s AND gameweek = %s
-        """, [player_id, gameweek])
+        # Update player's starter multiplier and recalculate True Value in one statement
+        execute_prepared(cursor, 'mo_upd', [multiplier, player_id, gameweek])
         
         # Get updated player data
-        cursor.execute("""
-            SELECT pm.true_value, pm.starter_multiplier, p.name
-            FROM player_metrics pm
-            JOIN players p ON pm.player_id = p.id
-            WHERE pm.player_id = %s AND pm.gameweek = %s
-        """, [player_id, gameweek])
+        execute_prepared(cursor, 'mo_sel', [player_id, gameweek])
         
         updated_player = cursor.fetchone()
         conn.commit()
-        conn.close()
+        release_db_connection(conn)
         
-        # Update manual overrides in system parameters
-        if 'manual_overrides' not in params['starter_prediction']:
-            params['starter_prediction']['manual_overrides'] = {}
+        # Update manual overrides (stored separately - main config file is untouched)
+        manual_overrides = starter_config.get('manual_overrides') or {}
         
         if override_type == 'auto':
             # Remove from manual overrides
-            if player_id in params['starter_prediction']['manual_overrides']:
-                del params['starter_prediction']['manual_overrides'][player_id]
+            manual_overrides.pop(player_id, None)
         else:
             # Add/update manual override
-            params['starter_prediction']['manual_overrides'][player_id] = {
+            manual_overrides[player_id] = {
                 'type': override_type,
                 'multiplier': multiplier
             }
         
-        save_system_parameters(params)
+        save_manual_overrides(manual_overrides)
         
         return jsonify({
             'success': True,
@@ -1023,80 +1258,37 @@ def verify_starter_status():
     """Validate starter status consistency and identify potential issues"""
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
         # Get current gameweek using GameweekManager for consistency
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        current_gameweek = gw_manager.get_current_gameweek()
+        current_gameweek = get_request_gameweek()
         
         # Analyze starter multiplier distribution
-        cursor.execute("""
-            SELECT 
-                starter_multiplier,
-                COUNT(*) as player_count,
-                ARRAY_AGG(player_name ORDER BY player_name) as players
-            FROM players 
-            WHERE starter_multiplier IS NOT NULL
-            GROUP BY starter_multiplier
-            ORDER BY starter_multiplier DESC
-        """)
-        
-        multiplier_distribution = []
-        for row in cursor.fetchall():
-            multiplier, count, players = row
-            multiplier_distribution.append({
-                'multiplier': float(multiplier),
-                'count': count,
-                'players': players[:10]  # Limit to first 10 for readability
-            })
+        execute_prepared(cursor, 'starter_dist')
+        multiplier_distribution = [
+            {'multiplier': float(r['starter_multiplier']), 'count': r['player_count'], 'players': r['players'] or []}
+            for r in cursor.fetchall()
+        ]
         
         # Check for unusual multiplier values (not in standard set)
-        standard_multipliers = {1.0, 0.65, 0.6, 0.0}
-        cursor.execute("""
-            SELECT player_name, starter_multiplier, team, position
-            FROM players 
-            WHERE starter_multiplier IS NOT NULL 
-              AND starter_multiplier NOT IN (1.0, 0.65, 0.6, 0.0)
-            ORDER BY starter_multiplier DESC, player_name
-        """)
-        
-        unusual_multipliers = []
-        for row in cursor.fetchall():
-            name, multiplier, team, position = row
-            unusual_multipliers.append({
-                'player_name': name,
-                'multiplier': float(multiplier),
-                'team': team,
-                'position': position
-            })
+        execute_prepared(cursor, 'starter_unusual')
+        unusual_multipliers = [
+            {'player_name': r['player_name'], 'multiplier': float(r['starter_multiplier']), 'team': r['team'], 'position': r['position']}
+            for r in cursor.fetchall()
+        ]
         
         # Check for players with missing starter data
-        cursor.execute("""
-            SELECT COUNT(*) as missing_count
-            FROM players 
-            WHERE starter_multiplier IS NULL
-        """)
-        missing_count = cursor.fetchone()[0]
-        
-        # Get manual override statistics
-        cursor.execute("""
-            SELECT COUNT(*) as total_players,
-                   COUNT(CASE WHEN starter_multiplier = 1.0 THEN 1 END) as starters,
-                   COUNT(CASE WHEN starter_multiplier = 0.65 THEN 1 END) as rotation_risks,
-                   COUNT(CASE WHEN starter_multiplier = 0.6 THEN 1 END) as bench_players,
-                   COUNT(CASE WHEN starter_multiplier = 0.0 THEN 1 END) as out_players
-            FROM players 
-            WHERE starter_multiplier IS NOT NULL
-        """)
+        execute_prepared(cursor, 'starter_missing')
+        missing_count = cursor.fetchone()['missing_count']
         
-        stats_row = cursor.fetchone()
+        # Derive override statistics from the distribution (no extra query)
+        counts_by_multiplier = {d['multiplier']: d['count'] for d in multiplier_distribution}
         statistics = {
-            'total_players': stats_row[0],
-            'starters': stats_row[1],
-            'rotation_risks': stats_row[2], 
-            'bench_players': stats_row[3],
-            'out_players': stats_row[4],
+            'total_players': sum(counts_by_multiplier.values()),
+            'starters': counts_by_multiplier.get(1.0, 0),
+            'rotation_risks': counts_by_multiplier.get(0.65, 0), 
+            'bench_players': counts_by_multiplier.get(0.6, 0),
+            'out_players': counts_by_multiplier.get(0.0, 0),
             'missing_data': missing_count
         }
         
@@ -1115,9 +1307,9 @@ def verify_starter_status():
             health_status = "WARNING" if health_status == "HEALTHY" else health_status
             issues.append(f"{missing_count} players missing starter multiplier data")
         
-        conn.close()
+        release_db_connection(conn)
         
-        return jsonify({
+        return fast_json({
             'success': True,
             'gameweek': current_gameweek,
             'health_status': health_status,
@@ -1134,15 +1326,20 @@ def verify_starter_status():
             'error': f'Validation failed: {str(e)}'
         }), 500
 
+def _cache_success_only(response) -> bool:
+    """Flask-Caching response filter - skip caching error tuples like (jsonify(...), 500)"""
+    return not isinstance(response, tuple)
+
 @app.route('/api/teams', methods=['GET'])
+@cache.cached(timeout=60, response_filter=_cache_success_only)
 def get_teams():
     """Get list of all teams"""
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT team FROM players ORDER BY team")
+        execute_prepared(cursor, 'teams_sel')
         teams = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        release_db_connection(conn)
         
         return jsonify({
             'teams': teams,
@@ -1152,6 +1349,7 @@ def get_teams():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/players-by-team', methods=['GET'])
+@cache.cached(timeout=60, query_string=True, response_filter=_cache_success_only)
 def get_players_by_team():
     """Get list of players for a specific team"""
     try:
@@ -1163,12 +1361,7 @@ def get_players_by_team():
         cursor = conn.cursor()
         
         # Get players from the specified team, ordered by name
-        cursor.execute("""
-            SELECT id, name, team, position 
-            FROM players 
-            WHERE team = %s 
-            ORDER BY name
-        """, (team,))
+        execute_prepared(cursor, 'team_players_sel', [team])
         
         players = []
         for row in cursor.fetchall():
@@ -1179,7 +1372,7 @@ def get_players_by_team():
                 'position': row[3]
             })
         
-        conn.close()
+        release_db_connection(conn)
         
         return jsonify(players)
         
@@ -1190,10 +1383,9 @@ def get_players_by_team():
 def get_gameweek_status():
     """Get current gameweek status for smart upload system"""
     try:
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
+        gw_manager = get_gameweek_manager()
         
-        current_gw = gw_manager.get_current_gameweek()
+        current_gw = get_request_gameweek()
         next_gw = gw_manager.get_next_gameweek()
         
         # Get detailed status for current gameweek
@@ -1218,15 +1410,12 @@ def get_gameweek_status():
 def check_gameweek_consistency():
     """Comprehensive gameweek consistency monitoring across all tables"""
     try:
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
         consistency_report = {
             'timestamp': datetime.now().isoformat(),
-            'gameweek_manager_detection': gw_manager.get_current_gameweek(),
+            'gameweek_manager_detection': get_request_gameweek(),
             'table_analysis': {},
             'consistency_issues': [],
             'overall_status': 'HEALTHY'
@@ -1241,64 +1430,89 @@ def check_gameweek_consistency():
             ('team_fixtures', 'gameweek')
         ]
         
+        # Resolve which tables/timestamp columns exist so one bad table can't fail the whole query
+        table_names = [table_name for table_name, _ in tables_to_check]
+        cursor.execute("""
+            SELECT table_name, column_name
+            FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND table_name = ANY(%s)
+              AND column_name IN ('gameweek', 'last_updated', 'created_at')
+        """, [table_names])
+        table_columns = {}
+        for row in cursor.fetchall():
+            table_columns.setdefault(row['table_name'], set()).add(row['column_name'])
+        
+        # Get every table's gameweek distribution in a single UNION ALL round trip
+        union_parts = []
         for table_name, gw_column in tables_to_check:
-            try:
-                # Get gameweek distribution
-                cursor.execute(f"""
-                    SELECT 
-                        {gw_column},
-                        COUNT(*) as record_count,
-                        MAX(COALESCE(last_updated, created_at, now())) as latest_update
-                    FROM {table_name}
-                    WHERE {gw_column} IS NOT NULL
-                    GROUP BY {gw_column}
-                    ORDER BY {gw_column} DESC
-                    LIMIT 5
-                """)
+            columns = table_columns.get(table_name, set())
+            if gw_column not in columns:
+                consistency_report['table_analysis'][table_name] = {
+                    'status': 'ERROR',
+                    'error': f'Table {table_name} (or its {gw_column} column) does not exist'
+                }
+                continue
+            timestamp_columns = [c for c in ('last_updated', 'created_at') if c in columns] + ['now()']
+            union_parts.append(f"""
+                SELECT 
+                    '{table_name}' as table_name,
+                    {gw_column} as gameweek,
+                    COUNT(*) as record_count,
+                    MAX(COALESCE({', '.join(timestamp_columns)})) as latest_update
+                FROM {table_name}
+                WHERE {gw_column} IS NOT NULL
+                GROUP BY {gw_column}
+            """)
+        
+        distributions = {}
+        if union_parts:
+            cursor.execute(" UNION ALL ".join(union_parts))
+            for row in cursor.fetchall():
+                distributions.setdefault(row['table_name'], []).append(row)
+        
+        for table_name, gw_column in tables_to_check:
+            if table_name in consistency_report['table_analysis']:
+                continue  # Already reported as missing
+            
+            # Latest 5 gameweeks per table
+            gameweek_data = sorted(distributions.get(table_name, []), key=lambda r: r['gameweek'], reverse=True)[:5]
+            
+            if gameweek_data:
+                latest_gw = gameweek_data[0]['gameweek']
+                latest_count = gameweek_data[0]['record_count']
                 
-                gameweek_data = cursor.fetchall()
+                consistency_report['table_analysis'][table_name] = {
+                    'latest_gameweek': latest_gw,
+                    'latest_record_count': latest_count,
+                    'latest_update': gameweek_data[0]['latest_update'].isoformat() if gameweek_data[0]['latest_update'] else None,
+                    'gameweek_distribution': [
+                        {'gameweek': row['gameweek'], 'count': row['record_count']} 
+                        for row in gameweek_data
+                    ]
+                }
                 
-                if gameweek_data:
-                    latest_gw = gameweek_data[0]['gameweek']
-                    latest_count = gameweek_data[0]['record_count']
-                    
-                    consistency_report['table_analysis'][table_name] = {
-                        'latest_gameweek': latest_gw,
-                        'latest_record_count': latest_count,
-                        'latest_update': gameweek_data[0]['latest_update'].isoformat() if gameweek_data[0]['latest_update'] else None,
-                        'gameweek_distribution': [
-                            {'gameweek': row['gameweek'], 'count': row['record_count']} 
-                            for row in gameweek_data
-                        ]
-                    }
-                    
-                    # Check for consistency issues
-                    gm_detection = consistency_report['gameweek_manager_detection']
-                    if latest_gw != gm_detection:
-                        consistency_report['consistency_issues'].append({
-                            'table': table_name,
-                            'issue': f'Table shows GW{latest_gw} but GameweekManager detects GW{gm_detection}',
-                            'severity': 'HIGH' if abs(latest_gw - gm_detection) > 1 else 'MEDIUM'
-                        })
-                    
-                    # Check for anomalous record counts (< 5% of expected)
-                    if latest_count < 32:  # Less than 5% of 647 players
-                        consistency_report['consistency_issues'].append({
-                            'table': table_name,
-                            'issue': f'Anomalous record count: {latest_count} records in GW{latest_gw} (expected >32)',
-                            'severity': 'HIGH'
-                        })
-                        
-                else:
-                    consistency_report['table_analysis'][table_name] = {
-                        'status': 'NO_DATA',
-                        'issue': 'No gameweek data found'
-                    }
+                # Check for consistency issues
+                gm_detection = consistency_report['gameweek_manager_detection']
+                if latest_gw != gm_detection:
+                    consistency_report['consistency_issues'].append({
+                        'table': table_name,
+                        'issue': f'Table shows GW{latest_gw} but GameweekManager detects GW{gm_detection}',
+                        'severity': 'HIGH' if abs(latest_gw - gm_detection) > 1 else 'MEDIUM'
+                    })
+                
+                # Check for anomalous record counts (< 5% of expected)
+                if latest_count < 32:  # Less than 5% of 647 players
+                    consistency_report['consistency_issues'].append({
+                        'table': table_name,
+                        'issue': f'Anomalous record count: {latest_count} records in GW{latest_gw} (expected >32)',
+                        'severity': 'HIGH'
+                    })
                     
-            except Exception as e:
+            else:
                 consistency_report['table_analysis'][table_name] = {
-                    'status': 'ERROR',
-                    'error': str(e)
+                    'status': 'NO_DATA',
+                    'issue': 'No gameweek data found'
                 }
         
         # Determine overall status
@@ -1317,8 +1531,8 @@ def check_gameweek_consistency():
                                  if data.get('status') != 'ERROR' and data.get('status') != 'NO_DATA'])
         }
         
-        conn.close()
-        return jsonify(consistency_report)
+        release_db_connection(conn)
+        return fast_json(consistency_report)
         
     except Exception as e:
         return jsonify({
@@ -1333,9 +1547,9 @@ def health_check():
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM players")
+        execute_prepared(cursor, 'player_count')
         player_count = cursor.fetchone()[0]
-        conn.close()
+        release_db_connection(conn)
         
         return jsonify({
             'status': 'healthy',
@@ -1351,6 +1565,19 @@ def health_check():
             'timestamp': time.time()
         }), 500
 
+# Lineup CSV format detection - individual player format headers (normalized once at import)
+LINEUP_INDIVIDUAL_HEADERS = ['Team', 'Player Name', 'Position', 'Predicted Status']
+_EXPECTED_INDIV = tuple(h.lower().replace(' ', '_') for h in LINEUP_INDIVIDUAL_HEADERS)
+_FORMATION_FIRST_COLUMNS = ('team', '!m-0')  # Known team identifiers (!m-0 is the FFS export)
+
+def detect_lineup_csv_format(header: List[str]) -> Optional[str]:
+    """Classify a lineup CSV header in one pass: 'individual', 'formation' (team + 11 players) or None"""
+    if tuple(h.strip().lower().replace(' ', '_') for h in header) == _EXPECTED_INDIV:
+        return 'individual'
+    if len(header) >= 12 and header[0].strip().lower().strip('"') in _FORMATION_FIRST_COLUMNS:
+        return 'formation'
+    return None
+
 @app.route('/api/import-lineups', methods=['POST'])
 def import_lineups():
     """
@@ -1368,53 +1595,24 @@ def import_lineups():
         if not file.filename.lower().endswith('.csv'):
             return jsonify({'error': 'File must be a CSV'}), 400
         
-        # Read CSV content and parse properly with quotes
-        import csv
-        from io import StringIO
-        
-        csv_content = file.read().decode('utf-8')
-        lines = csv_content.strip().split('\n')
+        # Stream the upload through a single CSV reader (handles quotes properly)
+        csv_reader = csv.reader(io.TextIOWrapper(file.stream, encoding='utf-8', newline=''))
+        header = next(csv_reader, None)
+        first_row = next(csv_reader, None)
         
-        if len(lines) < 2:
+        if header is None or first_row is None:
             return jsonify({'error': 'CSV must have header and data rows'}), 400
         
-        # Parse header using CSV reader to handle quotes properly
-        csv_reader = csv.reader(StringIO(lines[0]))
-        header = next(csv_reader)
+        data_rows = chain([first_row], csv_reader)
         
-        # Check for individual player format (original)
-        expected_individual_headers = ['Team', 'Player Name', 'Position', 'Predicted Status']
-        header_normalized = [h.strip().lower().replace(' ', '_') for h in header]
-        expected_individual_normalized = [h.strip().lower().replace(' ', '_') for h in expected_individual_headers]
+        csv_format = detect_lineup_csv_format(header)
+        is_formation_format = csv_format == 'formation'
         
-        is_individual_format = header_normalized == expected_individual_normalized
-        
-        # Check for formation matrix format (FFS scraping)
-        first_col_clean = header[0].strip().lower().strip('"')
-        
-        # Check if it's formation format: either starts with !m-0 OR has 12 columns with "player" pattern
-        is_formation_format = (
-            len(header) >= 12 and  # At least team + 11 players
-            (first_col_clean in ['team', '!m-0'] or  # Known team identifiers
-             (first_col_clean == '!m-0' and  # FFS format specifically
-              all('player' in h.lower() for h in header[1:12])))  # Player columns 1-11
-        )
-        
-        # Alternative detection: if we have 12 columns and the pattern looks like FFS format
-        if not is_formation_format and len(header) == 12:
-            is_formation_format = (
-                first_col_clean == '!m-0' and
-                header[1].lower().startswith('player') and
-                header[2].lower().startswith('player')
-            )
-        
-        # Debug logging (optional)
-        # print(f"CSV format detection: {is_formation_format}, teams will be mapped")
-        
-        if not is_individual_format and not is_formation_format:
+        if csv_format is None:
+            first_col_clean = header[0].strip().lower().strip('"') if header else ''
             return jsonify({
                 'error': f'Invalid CSV format. Expected either:\n' +
-                        f'1. Individual format: {expected_individual_headers}\n' +
+                        f'1. Individual format: {LINEUP_INDIVIDUAL_HEADERS}\n' +
                         f'2. Formation format: Team + 11 player columns\n' +
                         f'Got: {header}\n' +
                         f'First column detected as: "{first_col_clean}"'
@@ -1431,17 +1629,20 @@ def import_lineups():
         
         # Get system parameters for multipliers
         params = load_system_parameters()
-        rotation_penalty = params.get('starter_prediction', {}).get('auto_rotation_penalty', 0.65)
+        starter_config = params.get('starter_prediction', {})
+        rotation_penalty = starter_config.get('auto_rotation_penalty', 0.65)
+        bench_penalty = starter_config.get('force_bench_penalty', 0.6)
+        out_penalty = starter_config.get('force_out_penalty', 0.0)
         
-        # Initialize UnifiedNameMatcher for improved name matching
-        matcher = UnifiedNameMatcher(DB_CONFIG)
+        # Shared UnifiedNameMatcher for improved name matching
+        matcher = get_name_matcher()
         
         if is_formation_format:
             # Process formation matrix format (FFS scraping)
-            players_to_process = parse_formation_csv(lines[1:], cursor)  # Skip header
+            players_to_process = parse_formation_csv(data_rows, cursor)
         else:
             # Process individual player format (original)
-            players_to_process = parse_individual_csv(lines[1:])  # Skip header
+            players_to_process = parse_individual_csv(data_rows)
         
         for line_num, player_info in enumerate(players_to_process, 1):
             player_name = player_info['name']
@@ -1517,14 +1718,11 @@ def import_lineups():
                 unmatched_players.append(unmatched_info)
         
         # Update starter_multiplier in database using GameweekManager
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        gameweek = gw_manager.get_current_gameweek()  # Use current gameweek for lineup updates
+        gameweek = get_request_gameweek()  # Use current gameweek for lineup updates
         updated_count = 0
         
-        # Get manual overrides from system parameters to preserve them
-        params = load_system_parameters()
-        manual_overrides_section = params.get('starter_prediction', {}).get('manual_overrides', {})
+        # Get manual overrides from system parameters (loaded above) to preserve them
+        manual_overrides_section = starter_config.get('manual_overrides', {})
         
         # Handle case where manual_overrides is just a description dict
         if isinstance(manual_overrides_section, dict) and 'description' in manual_overrides_section:
@@ -1533,58 +1731,43 @@ def import_lineups():
             manual_overrides = manual_overrides_section if isinstance(manual_overrides_section, dict) else {}
         
         try:
-            # STEP 1: Set ALL players to rotation penalty EXCEPT those with manual overrides
-            cursor.execute("""
-                UPDATE player_metrics 
-                SET starter_multiplier = %s
-                WHERE gameweek = %s
-            """, [rotation_penalty, gameweek])
-            
-            all_players_updated = cursor.rowcount
-            print(f"Set {all_players_updated} players to rotation penalty ({rotation_penalty}x)")
-            
-            # STEP 2: Set matched CSV players to starter (1.0x) - BUT don't override manual settings
-            starter_ids = []
-            for starter in starters:
-                # Check if this player has a manual override - if so, skip CSV update
-                if starter['player_id'] not in manual_overrides:
-                    cursor.execute("""
-                        UPDATE player_metrics 
-                        SET starter_multiplier = %s
-                        WHERE player_id = %s AND gameweek = %s
-                    """, [1.0, starter['player_id'], gameweek])
-                    starter_ids.append(starter['player_id'])
-                    updated_count += 1
-                else:
-                    print(f"Skipping {starter['name']} - has manual override")
+            # STEP 1: Matched CSV players become starters (1.0x) - BUT don't override manual settings
+            # Players with a manual override skip the CSV update
+            starter_ids = [starter['player_id'] for starter in starters if starter['player_id'] not in manual_overrides]
+            final_multipliers = dict.fromkeys(starter_ids, 1.0)
+            updated_count += len(starter_ids)
+            if len(starter_ids) < len(starters):
+                logger.info("Skipped %d CSV starters with manual overrides", len(starters) - len(starter_ids))
             
-            print(f"Set {len(starter_ids)} matched players to starter (1.0x)")
+            # STEP 2: Re-apply any existing manual overrides
+            # 'auto' (or unknown) overrides are absent and fall back to the rotation penalty
+            override_multipliers = {
+                'starter': 1.0,
+                'rotation': rotation_penalty,
+                'bench': bench_penalty,
+                'out': out_penalty
+            }
+            applied_overrides = {
+                player_id: override_multipliers[override.get('type')]
+                for player_id, override in manual_overrides.items()
+                if override.get('type') in override_multipliers
+            }
+            final_multipliers.update(applied_overrides)
+            override_count = len(applied_overrides)
             
-            # STEP 3: Re-apply any existing manual overrides
-            starter_config = params.get('starter_prediction', {})
-            rotation_penalty = starter_config.get('auto_rotation_penalty', 0.75)
-            bench_penalty = starter_config.get('force_bench_penalty', 0.6)
-            out_penalty = starter_config.get('force_out_penalty', 0.0)
+            # STEP 3: Write every player's final multiplier in a single pass over the gameweek
+            # (prepared once per pooled connection; the arrays may be empty)
+            execute_prepared(cursor, 'lineup_upd', [
+                rotation_penalty,
+                list(final_multipliers.keys()),
+                list(final_multipliers.values()),
+                gameweek
+            ])
             
-            for player_id, override in manual_overrides.items():
-                override_type = override.get('type')
-                if override_type == 'starter':
-                    multiplier = 1.0
-                elif override_type == 'rotation':
-                    multiplier = rotation_penalty
-                elif override_type == 'bench':
-                    multiplier = bench_penalty
-                elif override_type == 'out':
-                    multiplier = out_penalty
-                else:
-                    continue  # Skip 'auto' - already handled above
-                
-                cursor.execute("""
-                    UPDATE player_metrics 
-                    SET starter_multiplier = %s
-                    WHERE player_id = %s AND gameweek = %s
-                """, [multiplier, player_id, gameweek])
-                print(f"Applied manual override: {player_id} = {multiplier}x ({override_type})")
+            # Rows already at their target multiplier are skipped (no dead tuples/WAL for no-op updates)
+            logger.info("Changed %d players' starter multipliers (default %sx)", cursor.rowcount, rotation_penalty)
+            logger.info("Set %d matched players to starter (1.0x)", len(starter_ids))
+            logger.info("Applied %d manual overrides", override_count)
             
             conn.commit()
             
@@ -1596,12 +1779,14 @@ def import_lineups():
             matched_players = len(starters) + len(non_starters)
             match_rate = (matched_players / total_players * 100) if total_players > 0 else 0
             
-            # Calculate confidence statistics
+            # Calculate confidence statistics (one vectorized pass over all confidences)
             all_matches = starters + non_starters
-            high_confidence = sum(1 for m in all_matches if m.get('confidence', 0) >= 95)
-            medium_confidence = sum(1 for m in all_matches if 85 <= m.get('confidence', 0) < 95)
+            confidences = np.fromiter((m.get('confidence', 0) for m in all_matches), dtype=np.float64, count=len(all_matches))
+            high_confidence = int((confidences >= 95).sum())
+            medium_confidence = int(((confidences >= 85) & (confidences < 95)).sum())
             
-            return jsonify({
+            # Detail lists can run to hundreds of nested entries on big uploads - encode with orjson
+            return fast_json({
                 'success': True,
                 'matching_system': 'UnifiedNameMatcher',
                 'csv_format': 'formation_matrix' if is_formation_format else 'individual_players',
@@ -1637,13 +1822,14 @@ def import_lineups():
         }), 500
     finally:
         if 'conn' in locals():
-            conn.close()
+            release_db_connection(conn)
 
 @app.route('/api/export', methods=['GET'])
 def export_players():
     """
     Export filtered player data as CSV
     """
+    streaming = False
     try:
         # Parse query parameters (same as /api/players)
         position = request.args.get('position')
@@ -1652,12 +1838,12 @@ def export_players():
         team = request.args.get('team')
         search = request.args.get('search', '').strip()
         # Use GameweekManager for unified gameweek detection
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        gameweek = gw_manager.get_current_gameweek()
+        gameweek = get_request_gameweek()
         
         conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        # Named (server-side) cursor so rows are streamed in batches instead of fetched all at once
+        cursor = conn.cursor(name='export_players', cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.itersize = 2000
         
         # Build query (same logic as /api/players but without pagination)
         base_query = """
@@ -1708,40 +1894,57 @@ def export_players():
         final_query = base_query + " ORDER BY pm.true_value DESC"
         
         cursor.execute(final_query, params)
-        players = cursor.fetchall()
-        
-        # Generate CSV content with gameweek metadata
-        csv_lines = []
-        csv_lines.append(f"# Fantrax Value Hunter Export - Gameweek {gameweek} - Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        csv_lines.append("Name,Team,Position,Price,PPG,Blended PPG,Value Score,True Value,ROI,Form Multiplier,Fixture Multiplier,Starter Multiplier,xGI Multiplier,Current Season Weight,Minutes,xG90,xA90,xGI90,xGI")
-        
-        for player in players:
-            current_weight = float(player['current_season_weight']) if player['current_season_weight'] else 0.0
-            minutes = player['minutes'] if player['minutes'] else 0
-            xg90 = float(player['xg90']) if player['xg90'] else 0.0
-            xa90 = float(player['xa90']) if player['xa90'] else 0.0
-            xgi90 = float(player['xgi90']) if player['xgi90'] else 0.0
-            xgi = float(player['xgi']) if player['xgi'] else 0.0
-            csv_lines.append(f"{player['name']},{player['team']},{player['position']},{player['price']},{player['ppg']},{player['blended_ppg']:.2f},{player['value_score']:.3f},{player['true_value']:.3f},{player['roi']:.3f},{player['form_multiplier']:.2f},{player['fixture_multiplier']:.2f},{player['starter_multiplier']:.2f},{player['xgi_multiplier']:.2f},{current_weight:.3f},{minutes},{xg90:.3f},{xa90:.3f},{xgi90:.3f},{xgi:.3f}")
-        
-        csv_content = '\n'.join(csv_lines)
-        
-        # Return CSV as downloadable file
-        from flask import Response
         
+        # Column order and fixed-precision formats for the export
+        export_columns = ['name', 'team', 'position', 'price', 'ppg', 'blended_ppg', 'value_score', 'true_value', 'roi',
+                          'form_multiplier', 'fixture_multiplier', 'starter_multiplier', 'xgi_multiplier',
+                          'current_season_weight', 'minutes', 'xg90', 'xa90', 'xgi90', 'xgi']
+        column_formats = {
+            'blended_ppg': '%.2f', 'value_score': '%.3f', 'true_value': '%.3f', 'roi': '%.3f',
+            'form_multiplier': '%.2f', 'fixture_multiplier': '%.2f', 'starter_multiplier': '%.2f', 'xgi_multiplier': '%.2f',
+            'current_season_weight': '%.3f', 'xg90': '%.3f', 'xa90': '%.3f', 'xgi90': '%.3f', 'xgi': '%.3f'
+        }
+        zero_filled = ['current_season_weight', 'minutes', 'xg90', 'xa90', 'xgi90', 'xgi']
+        
+        def format_chunk(rows) -> str:
+            """Format a batch of rows with pandas' vectorized CSV writer"""
+            df = pd.DataFrame(rows, columns=export_columns)
+            df[zero_filled] = df[zero_filled].fillna(0)
+            df['minutes'] = df['minutes'].astype(int)
+            for column, fmt in column_formats.items():
+                df[column] = np.char.mod(fmt, df[column].to_numpy(dtype=float))
+            return df.to_csv(header=False, index=False, lineterminator='\n')
+        
+        def generate_csv():
+            """Yield the CSV with gameweek metadata in batches, then return the connection"""
+            try:
+                yield f"# Fantrax Value Hunter Export - Gameweek {gameweek} - Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                yield "Name,Team,Position,Price,PPG,Blended PPG,Value Score,True Value,ROI,Form Multiplier,Fixture Multiplier,Starter Multiplier,xGI Multiplier,Current Season Weight,Minutes,xG90,xA90,xGI90,xGI\n"
+                
+                while True:
+                    rows = cursor.fetchmany(cursor.itersize)
+                    if not rows:
+                        break
+                    yield format_chunk(rows)
+            finally:
+                cursor.close()
+                release_db_connection(conn)
+        
+        # Return CSV as downloadable file, streamed as rows arrive from the server-side cursor
         response = Response(
-            csv_content,
+            stream_with_context(generate_csv()),
             mimetype='text/csv',
             headers={'Content-Disposition': f'attachment; filename=fantrax_players_gw{gameweek}.csv'}
         )
+        streaming = True  # generate_csv now owns the connection
         
         return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        if 'conn' in locals():
-            conn.close()
+        if 'conn' in locals() and not streaming:
+            release_db_connection(conn)
 
 # ===============================
 # NAME MATCHING VALIDATION API
@@ -1765,33 +1968,25 @@ def validate_import():
         if not players:
             return jsonify({'error': 'No player data provided'}), 400
         
-        # Initialize matcher
-        matcher = UnifiedNameMatcher(DB_CONFIG)
+        # Shared matcher
+        matcher = get_name_matcher()
+        
+        # Match all named players in one pass (shared lookups instead of per-player queries)
+        named_players = [p for p in players if p.get('name', '')]
+        match_results = matcher.match_players_bulk(named_players, source_system)
         
         # Process each player
         validation_results = []
-        position_breakdown = {}
+        position_breakdown = defaultdict(lambda: {'total': 0, 'matched': 0, 'match_rate': 0})
         
-        for player_data in players:
+        for player_data, match_result in zip(named_players, match_results):
             player_name = player_data.get('name', '')
             team = player_data.get('team', '')
             position = player_data.get('position', '')
             
-            if not player_name:
-                continue
-            
             # Update position breakdown
-            if position not in position_breakdown:
-                position_breakdown[position] = {'total': 0, 'matched': 0, 'match_rate': 0}
-            position_breakdown[position]['total'] += 1
-            
-            # Try to match the player
-            match_result = matcher.match_player(
-                source_name=player_name,
-                source_system=source_system,
-                team=team,
-                position=position
-            )
+            pos_stats = position_breakdown[position]
+            pos_stats['total'] += 1
             
             # Create player result
             player_result = {
@@ -1807,12 +2002,12 @@ def validate_import():
             
             # Update position stats
             if match_result['fantrax_id'] and not match_result['needs_review']:
-                position_breakdown[position]['matched'] += 1
+                pos_stats['matched'] += 1
         
-        # Calculate position match rates
+        # Calculate position match rates (every entry has total >= 1)
         for pos_stats in position_breakdown.values():
-            if pos_stats['total'] > 0:
-                pos_stats['match_rate'] = (pos_stats['matched'] / pos_stats['total']) * 100
+            pos_stats['match_rate'] = (pos_stats['matched'] / pos_stats['total']) * 100
+        position_breakdown = dict(position_breakdown)
         
         # Calculate overall stats
         total_players = len(validation_results)
@@ -1856,7 +2051,7 @@ def get_player_suggestions():
         position = data.get('position')
         top_n = data.get('top_n', 5)
         
-        matcher = UnifiedNameMatcher(DB_CONFIG)
+        matcher = get_name_matcher()
         
         suggestions = matcher.suggestion_engine.get_player_suggestions(
             source_name=source_name,
@@ -1896,9 +2091,10 @@ def confirm_mapping():
         user_id = data.get('user_id', 'web_user')
         confidence_override = data.get('confidence_override')
         
-        matcher = UnifiedNameMatcher(DB_CONFIG)
+        matcher = get_name_matcher()
         
-        success = matcher.confirm_mapping(
+        # Returns the saved mapping ID (via RETURNING) or None on failure
+        mapping_id = matcher.confirm_mapping(
             source_name=source_name,
             source_system=source_system,
             fantrax_id=fantrax_id,
@@ -1906,20 +2102,10 @@ def confirm_mapping():
             confidence_override=confidence_override
         )
         
-        if success:
-            # Get the mapping ID for response
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT id FROM name_mappings WHERE source_system = %s AND source_name = %s",
-                [source_system, source_name]
-            )
-            mapping_id = cursor.fetchone()
-            conn.close()
-            
+        if mapping_id:
             return jsonify({
                 'success': True,
-                'mapping_id': mapping_id[0] if mapping_id else None,
+                'mapping_id': mapping_id,
                 'message': 'Mapping confirmed successfully'
             })
         else:
@@ -1941,7 +2127,7 @@ def apply_import():
     """
     try:
         data = request.get_json()
-        print(f"Apply import called with data keys: {list(data.keys()) if data else 'None'}")
+        logger.debug("Apply import called with data keys: %s", list(data.keys()) if data else None)
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
@@ -1952,9 +2138,8 @@ def apply_import():
         dry_run = data.get('dry_run', False)
         players = data.get('players', [])
         
-        print(f"confirmed_mappings count: {len(confirmed_mappings)}")
-        print(f"players count: {len(players)}")
-        print(f"dry_run: {dry_run}")
+        logger.debug("confirmed_mappings count: %d, players count: %d, dry_run: %s",
+                     len(confirmed_mappings), len(players), dry_run)
         
         # Handle dry run case - just count confirmed mappings
         if dry_run:
@@ -1965,57 +2150,77 @@ def apply_import():
                 'message': f'Would import {import_count} players with {len(confirmed_mappings)} manual mappings'
             })
         
-        # Only create matcher for actual imports (not dry runs)
-        try:
-            matcher = UnifiedNameMatcher(DB_CONFIG)
-            print("UnifiedNameMatcher created successfully")
-        except Exception as e:
-            print(f"Error creating UnifiedNameMatcher: {e}")
-            return jsonify({
-                'success': False,
-                'error': f'UnifiedNameMatcher initialization failed: {str(e)}'
-            }), 500
+        # Only use the matcher for actual imports (not dry runs)
+        matcher = get_name_matcher()
         
         # Save all confirmed mappings
         saved_count = 0
         failed_mappings = []
         import_count = 0
         
-        for source_name, mapping_info in confirmed_mappings.items():
+        # Confirmations are independent upserts - run them on one leased connection rather
+        # than a connection each, so one large import can't drain the shared pool
+        if confirmed_mappings:
+            conn = get_db_connection()
             try:
-                success = matcher.confirm_mapping(
-                    source_name=source_name,
-                    source_system=source_system,
-                    fantrax_id=mapping_info['fantrax_id'],
-                    user_id=user_id,
-                    confidence_override=mapping_info.get('confidence', 100.0)
-                )
-                
-                if success:
-                    saved_count += 1
-                else:
-                    failed_mappings.append(source_name)
-                    
-            except Exception as e:
-                failed_mappings.append(f"{source_name}: {str(e)}")
+                for source_name, mapping_info in confirmed_mappings.items():
+                    try:
+                        success = matcher.confirm_mapping(
+                            source_name=source_name,
+                            source_system=source_system,
+                            fantrax_id=mapping_info['fantrax_id'],
+                            user_id=user_id,
+                            confidence_override=mapping_info.get('confidence', 100.0),
+                            conn=conn
+                        )
+                    except Exception as e:
+                        failed_mappings.append(f"{source_name}: {str(e)}")
+                        continue
+                    if success:
+                        saved_count += 1
+                    else:
+                        failed_mappings.append(source_name)
+            finally:
+                release_db_connection(conn)
         
         # Count how many players would be imported
-        for player in players:
-            player_name = player.get('name', '')
-            
-            # Check if this player would be successfully imported
-            if player_name in confirmed_mappings:
+        import_count = sum(1 for player in players if player.get('name', '') in confirmed_mappings)
+        unconfirmed = [player for player in players if player.get('name', '') not in confirmed_mappings]
+        
+        # Reuse the validate-import result when the client sends it (no re-matching needed)
+        matched_names = data.get('matched_names')
+        if matched_names is not None:
+            matched_names = set(matched_names)
+            import_count += sum(1 for player in unconfirmed if player.get('name', '') in matched_names)
+            unconfirmed = []
+        
+        # Look up the best existing mapping for every remaining name in one query
+        known_mappings = {}
+        if unconfirmed:
+            conn = get_db_connection()
+            try:
+                cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+                cursor.execute("""
+                    SELECT DISTINCT ON (source_name) source_name, fantrax_id, verified
+                    FROM name_mappings
+                    WHERE source_system = %s AND source_name = ANY(%s)
+                    ORDER BY source_name, verified DESC, confidence_score DESC
+                """, [source_system, list({player.get('name', '') for player in unconfirmed})])
+                known_mappings = {row['source_name']: row for row in cursor.fetchall()}
+            finally:
+                release_db_connection(conn)
+        
+        # Existing mappings count only when verified (unverified ones still need review)
+        for player in unconfirmed:
+            mapping = known_mappings.get(player.get('name', ''))
+            if mapping and mapping['fantrax_id'] and mapping['verified']:
+                import_count += 1
+        
+        # Only genuinely unknown names need the full matcher
+        unknown = [player for player in unconfirmed if player.get('name', '') not in known_mappings]
+        for match_result in matcher.match_players_bulk(unknown, source_system):
+            if match_result['fantrax_id'] and not match_result['needs_review']:
                 import_count += 1
-            else:
-                # Check if it has an existing mapping
-                match_result = matcher.match_player(
-                    source_name=player_name,
-                    source_system=source_system,
-                    team=player.get('team', ''),
-                    position=player.get('position', '')
-                )
-                if match_result['fantrax_id'] and not match_result['needs_review']:
-                    import_count += 1
         
         return jsonify({
             'success': True,
@@ -2061,36 +2266,36 @@ def get_name_mapping_stats():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get total mappings
-        cursor.execute("SELECT COUNT(*) FROM name_mappings")
-        total_mappings = cursor.fetchone()[0]
-        
-        # Get by source system
+        # Totals, per-source and per-verification counts in a single scan of name_mappings
         cursor.execute("""
-            SELECT source_system, COUNT(*) 
-            FROM name_mappings 
-            GROUP BY source_system 
-            ORDER BY COUNT(*) DESC
+            SELECT 
+                source_system,
+                verified,
+                GROUPING(source_system) as all_sources,
+                GROUPING(verified) as all_verified,
+                COUNT(*) as mapping_count,
+                COUNT(*) FILTER (WHERE created_at > NOW() - INTERVAL '24 hours') as recent_count
+            FROM name_mappings
+            GROUP BY GROUPING SETS ((), (source_system), (verified))
         """)
-        by_source_system = dict(cursor.fetchall())
         
-        # Get verified vs unverified
-        cursor.execute("""
-            SELECT verified, COUNT(*) 
-            FROM name_mappings 
-            GROUP BY verified
-        """)
-        verification_stats = dict(cursor.fetchall())
+        total_mappings = 0
+        recent_mappings = 0
+        by_source_system = {}
+        verification_stats = {}
+        for source_system, verified, all_sources, all_verified, mapping_count, recent_count in cursor.fetchall():
+            if all_sources and all_verified:
+                total_mappings = mapping_count
+                recent_mappings = recent_count
+            elif not all_sources:
+                by_source_system[source_system] = mapping_count
+            else:
+                verification_stats[verified] = mapping_count
         
-        # Get recent stats (last 24 hours)
-        cursor.execute("""
-            SELECT COUNT(*) 
-            FROM name_mappings 
-            WHERE created_at > NOW() - INTERVAL '24 hours'
-        """)
-        recent_mappings = cursor.fetchone()[0]
+        # Largest source systems first
+        by_source_system = dict(sorted(by_source_system.items(), key=lambda item: item[1], reverse=True))
         
-        conn.close()
+        release_db_connection(conn)
         
         return jsonify({
             'total_mappings': total_mappings,
@@ -2113,6 +2318,144 @@ def get_name_mapping_stats():
 # FORM DATA IMPORT
 # ===============================
 
+# Form imports hand the V2.0 True Value recalculation to a background worker, so the upload
+# responds as soon as the imported rows are committed
+_recalc_executor = ThreadPoolExecutor(max_workers=1)
+
+# Outcome of the last background recalculation per gameweek (running/done/failed),
+# read by /api/recalc-status so the upload page can report when True Values are fresh
+_recalc_status: Dict[int, Dict[str, Any]] = {}
+_recalc_status_lock = threading.Lock()
+
+def set_recalc_status(gameweek: int, state: str, **details):
+    """Record the state of the background recalculation for a gameweek"""
+    with _recalc_status_lock:
+        _recalc_status[gameweek] = {
+            'gameweek': gameweek,
+            'state': state,
+            'updated_at': datetime.now().isoformat(),
+            **details
+        }
+
+def recalculate_form_import_v2(gameweek: int):
+    """Recalculate V2.0 True Values for a freshly imported gameweek (runs on _recalc_executor)"""
+    with app.app_context():
+        try:
+            conn = get_db_connection()
+        except Exception as e:
+            logger.error("V2.0 recalculation for GW%s could not get a connection: %s", gameweek, e)
+            set_recalc_status(gameweek, 'failed', error=str(e))
+            return
+        cursor = conn.cursor()
+        try:
+            parameters = load_system_parameters()
+            engine = FormulaEngineV2(DB_CONFIG, parameters)
+            
+            # Get fresh player data with corrected PPG using same logic as V2.0 API
+            # (dict rows - the engine and the loop below read columns by name)
+            dict_cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            dict_cursor.execute("""
+                SELECT 
+                    p.id as player_id, p.name, p.team, p.position,
+                    p.xgi90, p.baseline_xgi, pm.price,
+                    -- Calculate fresh PPG using same logic as form import
+                    CASE 
+                        WHEN COALESCE(pgd.games_played, 0) > 0 
+                        THEN COALESCE(pf_max.total_points, 0) / pgd.games_played
+                        ELSE 0 
+                    END as ppg,
+                    pm.form_multiplier, pm.fixture_multiplier, 
+                    pm.starter_multiplier, pm.xgi_multiplier,
+                    tf.difficulty_score as fixture_difficulty,
+                    COALESCE(pgd.games_played, 0) as games_played,
+                    COALESCE(pgd.games_played_historical, 0) as games_played_historical,
+                    CASE 
+                        WHEN COALESCE(pgd.games_played_historical, 0) > 0 
+                        THEN COALESCE(pgd.total_points_historical, 0) / pgd.games_played_historical 
+                        ELSE NULL 
+                    END as historical_ppg,
+                    -- Last 5 gameweeks of points (most recent first) for the EWMA form multiplier,
+                    -- so the engine does not open a connection per player to fetch them
+                    COALESCE(recent.points, '{}') as recent_points
+                FROM players p
+                JOIN player_metrics pm ON p.id = pm.player_id
+                LEFT JOIN (
+                    SELECT player_id, MAX(points) as total_points
+                    FROM player_form
+                    GROUP BY player_id
+                ) pf_max ON p.id = pf_max.player_id
+                LEFT JOIN LATERAL (
+                    SELECT ARRAY_AGG(r.points ORDER BY r.gameweek DESC) as points
+                    FROM (
+                        SELECT COALESCE(points, 0)::float8 as points, gameweek
+                        FROM player_form
+                        WHERE player_id = p.id
+                        ORDER BY gameweek DESC
+                        LIMIT 5
+                    ) r
+                ) recent ON true
+                LEFT JOIN team_fixtures tf ON p.team = tf.team_code AND tf.gameweek = %s
+                LEFT JOIN player_games_data pgd ON p.id = pgd.player_id AND pgd.gameweek = %s
+                WHERE pm.gameweek = %s
+                  AND p.team != 'TST'  -- Exclude test players
+                ORDER BY p.name
+            """, [gameweek, gameweek, gameweek])
+            
+            players = dict_cursor.fetchall()
+            dict_cursor.close()
+            
+            # With recent points preloaded the engine runs are pure CPU and cheap per player
+            calcs = [engine.calculate_player_value(player) for player in players]
+            
+            metrics_updates = []
+            player_updates = []
+            for player, calc in zip(players, calcs):
+                metrics_updates.append((player['player_id'], gameweek, calc['true_value'], calc['roi']))
+                player_updates.append((player['player_id'], calc['true_value'], calc['roi'], calc.get('base_ppg', 0)))
+            
+            # Write all results with one UPDATE per table instead of two per player
+            psycopg2.extras.execute_values(cursor, """
+                UPDATE player_metrics pm
+                SET true_value = v.true_value, value_score = v.roi, last_updated = NOW()
+                FROM (VALUES %s) AS v(player_id, gameweek, true_value, roi)
+                WHERE pm.player_id = v.player_id AND pm.gameweek = v.gameweek
+            """, metrics_updates, template="(%s, %s, %s::float8, %s::float8)", page_size=1000)
+            
+            psycopg2.extras.execute_values(cursor, """
+                UPDATE players p
+                SET true_value = v.true_value, roi = v.roi, blended_ppg = v.blended_ppg
+                FROM (VALUES %s) AS v(player_id, true_value, roi, blended_ppg)
+                WHERE p.id = v.player_id
+            """, player_updates, template="(%s, %s::float8, %s::float8, %s::float8)", page_size=1000)
+            updated = len(players)
+            
+            conn.commit()
+            logger.info("V2.0 recalculation for GW%s completed for %s players", gameweek, updated)
+            
+            # True Values changed - drop cached team and player lists
+            cache.clear()
+            set_recalc_status(gameweek, 'done', updated_players=updated)
+        except Exception as e:
+            conn.rollback()
+            logger.exception("V2.0 recalculation for GW%s failed", gameweek)
+            set_recalc_status(gameweek, 'failed', error=str(e))
+        finally:
+            release_db_connection(conn)
+
+@app.route('/api/recalc-status/<int:gameweek>', methods=['GET'])
+def get_recalc_status(gameweek):
+    """Get the state of the last background V2.0 recalculation for a gameweek"""
+    with _recalc_status_lock:
+        status = _recalc_status.get(gameweek)
+    if status is None:
+        return jsonify({
+            'success': False,
+            'gameweek': gameweek,
+            'state': 'unknown',
+            'error': f'No recalculation has been started for GW{gameweek} since the server started'
+        }), 404
+    return jsonify({'success': True, **status})
+
 @app.route('/api/import-form-data', methods=['POST'])
 def import_form_data():
     """
@@ -2122,8 +2465,7 @@ def import_form_data():
     """
     try:
         # GameweekManager integration with intelligent validation
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
+        gw_manager = get_gameweek_manager()
         
         gameweek_input = request.form.get('gameweek')
         if gameweek_input:
@@ -2142,7 +2484,7 @@ def import_form_data():
                     'success': False,
                     'error': validation_result['message'],
                     'suggested_gameweek': validation_result.get('suggested_gameweek'),
-                    'current_gameweek': gw_manager.get_current_gameweek()
+                    'current_gameweek': get_request_gameweek()
                 }), 400
                 
             gameweek = gameweek_input
@@ -2171,17 +2513,12 @@ def import_form_data():
                 'error': 'No file selected'
             }), 400
         
-        # Read CSV file
-        import pandas as pd
-        import io
-        
-        # Read the CSV content
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_input = pd.read_csv(stream)
+        # Read CSV file - stream rows as plain dicts straight from the upload
+        reader = csv.DictReader(io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline=''))
         
         # Validate required columns
         required_columns = ['ID', 'Player', 'FPts', 'Salary']
-        missing_columns = [col for col in required_columns if col not in csv_input.columns]
+        missing_columns = [col for col in required_columns if col not in (reader.fieldnames or [])]
         if missing_columns:
             return jsonify({
                 'success': False,
@@ -2192,228 +2529,196 @@ def import_form_data():
         conn = get_db_connection()
         cursor = conn.cursor()
         
+        # Only the first few messages are returned, so only those are kept (counts cover everything)
+        max_errors_shown = 10
+        max_players_shown = 20
         imported_count = 0
         error_count = 0
         errors = []
         skipped_players = []
         
-        # Get all existing player IDs to check against
-        cursor.execute("SELECT id FROM players")
-        existing_player_ids = set(row[0] for row in cursor.fetchall())
-        new_players_added = []
+        # Season points (max of player_form) and games played from every other gameweek, so PPG
+        # can be computed here and written with the metrics upsert instead of a separate UPDATE
+        cursor.execute("""
+            SELECT COALESCE(pf.player_id, pgd.player_id), pf.total_points, pgd.games_played
+            FROM (
+                SELECT player_id, MAX(points) as total_points
+                FROM player_form
+                WHERE gameweek <> %s
+                GROUP BY player_id
+            ) pf
+            FULL JOIN (
+                SELECT player_id, SUM(games_played) as games_played
+                FROM player_games_data
+                WHERE gameweek <> %s
+                GROUP BY player_id
+            ) pgd ON pf.player_id = pgd.player_id
+        """, [gameweek, gameweek])
+        season_totals = {pid: (total_points, games_played) for pid, total_points, games_played in cursor.fetchall()}
+        
+        # Collect rows per table first, then write each table with one batched upsert.
+        # Keyed by player_id so a player repeated in the CSV keeps its last row (as the
+        # per-row upserts did) and no upsert touches the same key twice.
+        csv_rows = {}
         
-        for index, row in csv_input.iterrows():
+        for index, row in enumerate(reader):
             try:
                 # Extract player ID (remove asterisks from ID column)
-                player_id = str(row['ID']).strip('*')
+                player_id = row['ID'].strip('*')
                 player_name = row.get('Player', 'Unknown')
                 team = row.get('Team', 'UNK')
                 position = row.get('Position', 'UNK')
                 
-                # Check if player exists in our database
-                if player_id not in existing_player_ids:
-                    # Auto-add new player to database
-                    try:
-                        cursor.execute("""
-                            INSERT INTO players (id, name, team, position, updated_at, minutes, xg90, xa90, xgi90, last_understat_update)
-                            VALUES (%s, %s, %s, %s, NOW(), %s, %s, %s, %s, NOW())
-                        """, (player_id, player_name, team, position, 0, 0.000, 0.000, 0.000))
-                        
-                        existing_player_ids.add(player_id)  # Add to our tracking set
-                        new_players_added.append(f"{player_name} ({team}, {position})")
-                        print(f"Auto-added new player: {player_name} - {team} ({position}) [ID: {player_id}]")
-                        
-                    except Exception as add_error:
-                        error_count += 1
-                        skipped_players.append(f"{player_name} (ID: {player_id}) - Failed to add: {add_error}")
-                        continue
-                
                 # Get fantasy points and price
                 fpts = float(row['FPts'])
                 salary = float(row['Salary'])
-                print(f"DEBUG - Price for {player_name}: {salary} (from CSV column 'Salary')")
-                
-                # Insert/update player form data
-                cursor.execute("""
-                    INSERT INTO player_form (player_id, gameweek, points, timestamp)
-                    VALUES (%s, %s, %s, NOW())
-                    ON CONFLICT (player_id, gameweek) 
-                    DO UPDATE SET points = EXCLUDED.points, timestamp = NOW()
-                """, [player_id, gameweek, fpts])
-                
-                # Insert/update player_metrics with price
-                cursor.execute("""
-                    INSERT INTO player_metrics (player_id, gameweek, price, last_updated)
-                    VALUES (%s, %s, %s, NOW())
-                    ON CONFLICT (player_id, gameweek) 
-                    DO UPDATE SET price = EXCLUDED.price, last_updated = NOW()
-                """, [player_id, gameweek, salary])
-                
-                # Update games_played count using minutes-based logic
-                # Compare current total minutes vs first game minutes to detect if player played this gameweek
-                
-                # Get current total minutes from players table (updated by Understat sync)
-                cursor.execute("SELECT COALESCE(minutes, 0) FROM players WHERE id = %s", [player_id])
-                current_total_minutes = cursor.fetchone()[0] or 0
-                
-                # Get previous gameweek minutes from raw_player_snapshots for rolling comparison
-                previous_gameweek = gameweek - 1
-                cursor.execute("""
-                    SELECT COALESCE(minutes_played, 0) 
-                    FROM raw_player_snapshots 
-                    WHERE player_id = %s AND gameweek = %s
-                """, [player_id, previous_gameweek])
-                previous_gameweek_result = cursor.fetchone()
-                previous_gameweek_minutes = previous_gameweek_result[0] if previous_gameweek_result else 0
-                
-                # Player played this gameweek if total minutes > previous gameweek minutes
-                games_played = 1 if current_total_minutes > previous_gameweek_minutes else 0
-                cursor.execute("""
-                    INSERT INTO player_games_data (player_id, gameweek, games_played, last_updated)
-                    VALUES (%s, %s, %s, NOW())
-                    ON CONFLICT (player_id, gameweek)
-                    DO UPDATE SET games_played = EXCLUDED.games_played, last_updated = NOW()
-                """, [player_id, gameweek, games_played])
-                
-                # NEW: Capture raw data snapshot for trend analysis
-                cursor.execute("""
-                    INSERT INTO raw_player_snapshots 
-                    (player_id, gameweek, name, team, position, price, fpts, 
-                     minutes_played, fantrax_import, import_timestamp)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                    ON CONFLICT (player_id, gameweek) 
-                    DO UPDATE SET 
-                        price = EXCLUDED.price,
-                        fpts = EXCLUDED.fpts,
-                        name = EXCLUDED.name,
-                        team = EXCLUDED.team,
-                        position = EXCLUDED.position,
-                        fantrax_import = TRUE,
-                        import_timestamp = NOW()
-                """, [player_id, gameweek, player_name, team, position, salary, fpts, 0, True])
-                
-                # Also capture in raw form snapshots for EWMA calculations
-                cursor.execute("""
-                    INSERT INTO raw_form_snapshots 
-                    (player_id, gameweek, points_scored, minutes_played, games_played, import_timestamp)
-                    VALUES (%s, %s, %s, %s, %s, NOW())
-                    ON CONFLICT (player_id, gameweek)
-                    DO UPDATE SET 
-                        points_scored = EXCLUDED.points_scored,
-                        games_played = EXCLUDED.games_played,
-                        import_timestamp = NOW()
-                """, [player_id, gameweek, fpts, 0, games_played])
-                
-                imported_count += 1
-                
             except Exception as e:
                 error_count += 1
-                player_name = row.get('Player', 'Unknown')
-                errors.append(f"Row {index + 1} ({player_name}): {str(e)}")
+                if len(errors) < max_errors_shown:
+                    errors.append(f"Row {index + 1} ({row.get('Player', 'Unknown')}): {str(e)}")
                 
                 # Don't fail completely for individual row errors
                 continue
+            
+            csv_rows[player_id] = (player_name, team, position, fpts, salary)
+            imported_count += 1
+        
+        # Auto-add players not yet in our database - Postgres decides which are new
+        # (ON CONFLICT DO NOTHING) and returns just those ids
+        new_player_ids = set()
+        if csv_rows:
+            added = psycopg2.extras.execute_values(cursor, """
+                INSERT INTO players (id, name, team, position, updated_at, minutes, xg90, xa90, xgi90, last_understat_update)
+                VALUES %s
+                ON CONFLICT (id) DO NOTHING
+                RETURNING id
+            """, [(player_id, player_name, team, position, 0, 0.000, 0.000, 0.000)
+                  for player_id, (player_name, team, position, fpts, salary) in csv_rows.items()],
+                template="(%s, %s, %s, %s, NOW(), %s, %s, %s, %s, NOW())", page_size=500, fetch=True)
+            new_player_ids = {row[0] for row in added}
         
-        # Recalculate PPG from current season data after import
-        print(f"Recalculating PPG for gameweek {gameweek}...")
+        new_players_added = []
+        for player_id, (player_name, team, position, fpts, salary) in csv_rows.items():
+            if player_id in new_player_ids:
+                if len(new_players_added) < max_players_shown:
+                    new_players_added.append(f"{player_name} ({team}, {position})")
+                logger.debug("Auto-added new player: %s - %s (%s) [ID: %s]", player_name, team, position, player_id)
+        
+        # Whether each uploaded player played this gameweek: current total minutes (kept up to date
+        # by Understat sync) above the previous gameweek's raw_player_snapshots minutes
+        previous_gameweek = gameweek - 1
         cursor.execute("""
-            UPDATE player_metrics pm
-            SET ppg = (
-                SELECT 
-                    CASE 
-                        WHEN COALESCE(pgd.games_played_current, 0) > 0 
-                        THEN COALESCE(pf_max.total_points, 0) / pgd.games_played_current
-                        ELSE 0 
-                    END
-                FROM (
-                    SELECT player_id, MAX(points) as total_points
-                    FROM player_form
-                    WHERE player_id = pm.player_id
-                    GROUP BY player_id
-                ) pf_max
-                LEFT JOIN (
-                    SELECT player_id, SUM(games_played) as games_played_current
-                    FROM player_games_data 
-                    WHERE player_id = pm.player_id
-                    GROUP BY player_id
-                ) pgd ON pf_max.player_id = pgd.player_id
-                LIMIT 1
-            )
-            WHERE pm.gameweek = %s
-        """, [gameweek])
-        print(f"PPG recalculation completed.")
-        
-        # Auto-trigger V2.0 recalculation with fresh PPG data
-        print(f"Triggering V2.0 True Value recalculation...")
-        try:
-            # Import at function level to avoid circular imports
-            from calculation_engine_v2 import FormulaEngineV2
+            SELECT p.id, (COALESCE(p.minutes, 0) > COALESCE(r.minutes_played, 0))::int AS played
+            FROM players p
+            LEFT JOIN raw_player_snapshots r ON r.player_id = p.id AND r.gameweek = %s
+            WHERE p.id = ANY(%s)
+        """, [previous_gameweek, list(csv_rows)])
+        played_this_gameweek = dict(cursor.fetchall())
+        
+        logger.info("Form import GW%s: %d rows parsed, %d new players, %d row errors",
+                    gameweek, imported_count, len(new_player_ids), error_count)
+        
+        if csv_rows:
+            form_rows = []
+            metrics_rows = []
+            games_rows = []
+            snapshot_rows = []
+            form_snapshot_rows = []
+            for player_id, (player_name, team, position, fpts, salary) in csv_rows.items():
+                # Update games_played count using minutes-based logic (auto-added players have 0 minutes)
+                games_played = played_this_gameweek.get(player_id, 0)
+                
+                # PPG from current season data: MAX(points) / SUM(games_played), including this gameweek
+                # (points are stored as numeric(6,2), so compare against the rounded value)
+                previous_points, previous_games = season_totals.get(player_id, (None, None))
+                points = round(fpts, 2)
+                total_points = points if previous_points is None else max(float(previous_points), points)
+                total_games = (previous_games or 0) + games_played
+                ppg = total_points / total_games if total_games > 0 else 0
+                
+                form_rows.append((player_id, gameweek, fpts))
+                metrics_rows.append((player_id, gameweek, salary, ppg))
+                games_rows.append((player_id, gameweek, games_played))
+                snapshot_rows.append((player_id, gameweek, player_name, team, position, salary, fpts, 0, True))
+                form_snapshot_rows.append((player_id, gameweek, fpts, 0, games_played))
             
-            parameters = load_system_parameters()
-            engine = FormulaEngineV2(DB_CONFIG, parameters)
+            # Insert/update player form data
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO player_form (player_id, gameweek, points, timestamp)
+                VALUES %s
+                ON CONFLICT (player_id, gameweek) 
+                DO UPDATE SET points = EXCLUDED.points, timestamp = NOW()
+            """, form_rows, template="(%s, %s, %s, NOW())", page_size=500)
             
-            # Get fresh player data with corrected PPG using same logic as V2.0 API
-            cursor.execute("""
-                SELECT 
-                    p.id as player_id, p.name, p.team, p.position,
-                    p.xgi90, p.baseline_xgi, pm.price,
-                    -- Calculate fresh PPG using same logic as form import
-                    CASE 
-                        WHEN COALESCE(pgd.games_played, 0) > 0 
-                        THEN COALESCE(pf_max.total_points, 0) / pgd.games_played
-                        ELSE 0 
-                    END as ppg,
-                    pm.form_multiplier, pm.fixture_multiplier, 
-                    pm.starter_multiplier, pm.xgi_multiplier,
-                    tf.difficulty_score as fixture_difficulty,
-                    COALESCE(pgd.games_played, 0) as games_played,
-                    COALESCE(pgd.games_played_historical, 0) as games_played_historical,
-                    CASE 
-                        WHEN COALESCE(pgd.games_played_historical, 0) > 0 
-                        THEN COALESCE(pgd.total_points_historical, 0) / pgd.games_played_historical 
-                        ELSE NULL 
-                    END as historical_ppg
-                FROM players p
-                JOIN player_metrics pm ON p.id = pm.player_id
-                LEFT JOIN (
-                    SELECT player_id, MAX(points) as total_points
-                    FROM player_form
-                    GROUP BY player_id
-                ) pf_max ON p.id = pf_max.player_id
-                LEFT JOIN team_fixtures tf ON p.team = tf.team_code AND tf.gameweek = %s
-                LEFT JOIN player_games_data pgd ON p.id = pgd.player_id AND pgd.gameweek = %s
-                WHERE pm.gameweek = %s
-                  AND p.team != 'TST'  -- Exclude test players
-                ORDER BY p.name
-            """, [gameweek, gameweek, gameweek])
+            # Insert/update player_metrics with price and recalculated PPG
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO player_metrics (player_id, gameweek, price, ppg, last_updated)
+                VALUES %s
+                ON CONFLICT (player_id, gameweek) 
+                DO UPDATE SET price = EXCLUDED.price, ppg = EXCLUDED.ppg, last_updated = NOW()
+            """, metrics_rows, template="(%s, %s, %s, %s, NOW())", page_size=500)
             
-            players = cursor.fetchall()
-            updated = 0
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO player_games_data (player_id, gameweek, games_played, last_updated)
+                VALUES %s
+                ON CONFLICT (player_id, gameweek)
+                DO UPDATE SET games_played = EXCLUDED.games_played, last_updated = NOW()
+            """, games_rows, template="(%s, %s, %s, NOW())", page_size=500)
             
-            for player in players:
-                calc = engine.calculate_player_value(dict(player))
-                cursor.execute("""
-                    UPDATE player_metrics 
-                    SET true_value = %s, value_score = %s, last_updated = NOW()
-                    WHERE player_id = %s AND gameweek = %s
-                """, [calc['true_value'], calc['roi'], player['player_id'], gameweek])
-                
-                cursor.execute("""
-                    UPDATE players 
-                    SET true_value = %s, roi = %s, blended_ppg = %s
-                    WHERE id = %s
-                """, [calc['true_value'], calc['roi'], calc.get('base_ppg', 0), player['player_id']])
-                
-                updated += 1
+            # NEW: Capture raw data snapshot for trend analysis
+            # Snapshots are the largest writes per import - COPY into staging tables, then upsert from them
+            copy_into_temp_table(cursor, 'tmp_player_snapshots', 'raw_player_snapshots',
+                                 ['player_id', 'gameweek', 'name', 'team', 'position', 'price', 'fpts',
+                                  'minutes_played', 'fantrax_import'], snapshot_rows)
+            cursor.execute("""
+                INSERT INTO raw_player_snapshots 
+                (player_id, gameweek, name, team, position, price, fpts, 
+                 minutes_played, fantrax_import, import_timestamp)
+                SELECT player_id, gameweek, name, team, position, price, fpts,
+                       minutes_played, fantrax_import, NOW()
+                FROM tmp_player_snapshots
+                ON CONFLICT (player_id, gameweek) 
+                DO UPDATE SET 
+                    price = EXCLUDED.price,
+                    fpts = EXCLUDED.fpts,
+                    name = EXCLUDED.name,
+                    team = EXCLUDED.team,
+                    position = EXCLUDED.position,
+                    fantrax_import = TRUE,
+                    import_timestamp = NOW()
+            """)
             
-            print(f"V2.0 recalculation completed for {updated} players")
-        except Exception as e:
-            print(f"Warning: V2.0 recalculation failed: {e}")
-            # Don't fail the entire import if V2.0 recalc fails
-        
-        # Commit all changes (including V2.0 updates)
+            # Also capture in raw form snapshots for EWMA calculations
+            copy_into_temp_table(cursor, 'tmp_form_snapshots', 'raw_form_snapshots',
+                                 ['player_id', 'gameweek', 'points_scored', 'minutes_played', 'games_played'],
+                                 form_snapshot_rows)
+            cursor.execute("""
+                INSERT INTO raw_form_snapshots 
+                (player_id, gameweek, points_scored, minutes_played, games_played, import_timestamp)
+                SELECT player_id, gameweek, points_scored, minutes_played, games_played, NOW()
+                FROM tmp_form_snapshots
+                ON CONFLICT (player_id, gameweek)
+                DO UPDATE SET 
+                    points_scored = EXCLUDED.points_scored,
+                    games_played = EXCLUDED.games_played,
+                    import_timestamp = NOW()
+            """)
+        
+        # Commit all imported data
         conn.commit()
-        conn.close()
+        release_db_connection(conn)
+        
+        # Player roster/values changed - drop cached team and player lists
+        cache.clear()
+        # A new gameweek may now exist - don't serve the old current gameweek from cache
+        _gw_manager.clear_cache()
+        # New players may now match names that previously had no candidate
+        _name_matcher.clear_cache()
+        
+        # Auto-trigger V2.0 recalculation with fresh PPG data, outside the request
+        logger.info("Triggering V2.0 True Value recalculation for GW%s in the background", gameweek)
+        set_recalc_status(gameweek, 'running')
+        _recalc_executor.submit(recalculate_form_import_v2, gameweek)
         
         # V2.0 calculations are always enabled - no parameter toggles needed
         
@@ -2422,12 +2727,12 @@ def import_form_data():
             'message': f'Form data import completed for gameweek {gameweek}',
             'imported_count': imported_count,
             'error_count': error_count,
-            'errors': errors[:10],  # Limit errors shown
-            'skipped_players': skipped_players[:20],  # Show first 20 skipped players
-            'new_players_added': new_players_added[:20],  # Show first 20 auto-added players
-            'total_new_players': len(new_players_added),
+            'errors': errors,  # First max_errors_shown errors
+            'skipped_players': skipped_players[:max_players_shown],  # Show first 20 skipped players
+            'new_players_added': new_players_added,  # First max_players_shown auto-added players
+            'total_new_players': len(new_player_ids),
             'gameweek': gameweek,
-            'trigger_recalc': True  # Signal to frontend to trigger recalculation
+            'trigger_recalc': True  # Recalculation is queued - frontend polls /api/recalc-status/<gameweek>
         })
         
     except Exception as e:
@@ -2440,6 +2745,53 @@ def import_form_data():
 # ODDS IMPORT ENDPOINT (Sprint 6)
 # ===============================
 
+# OddsPortal team name -> Fantrax team code mapping
+ODDS_TO_FANTRAX = {
+    "Arsenal": "ARS", "Aston Villa": "AVL", "Bournemouth": "BOU",
+    "Brentford": "BRF", "Brighton": "BHA", "Burnley": "BUR", 
+    "Chelsea": "CHE", "Crystal Palace": "CRY", "Everton": "EVE",
+    "Fulham": "FUL", "Leeds": "LEE", "Liverpool": "LIV",
+    "Manchester City": "MCI", "Manchester Utd": "MUN", "Newcastle": "NEW",
+    "Nottingham": "NOT", "Sunderland": "SUN", "Tottenham": "TOT",
+    "West Ham": "WHU", "Wolves": "WOL",
+    # OddsPortal variations for missing teams
+    "Man City": "MCI", "Man United": "MUN", "Tottenham Hotspur": "TOT",
+    "West Ham United": "WHU", "Wolverhampton": "WOL", "Brighton & Hove Albion": "BHA",
+    "Nottm Forest": "NOT", "Nottingham Forest": "NOT", "Leeds United": "LEE"
+}
+
+# Middle-column values that mark the "Date, Home, Separator, Away, Odds..." odds CSV format
+ODDS_FORMAT_SEPARATORS = frozenset((':', '–', '-', 'vs'))
+
+@lru_cache(maxsize=64)
+def parse_odds_date(date_str: str) -> date:
+    """Parse an odds CSV date; cached since every fixture on a matchday repeats the same string"""
+    try:
+        # Try parsing "22 Aug 2025" format
+        return datetime.strptime(date_str, '%d %b %Y').date()
+    except ValueError:
+        # Try alternative formats if needed
+        return date.fromisoformat(date_str)
+
+def calculate_difficulty_scores(home_odds: float, draw_odds: float, away_odds: float) -> Tuple[float, float]:
+    """
+    Fixture difficulty for the home and away side on a -10 to +10 scale (0 = neutral),
+    from the opponent's normalized implied win probability
+    """
+    # Calculate implied probabilities (simplified - not accounting for overround)
+    home_prob = 1 / home_odds
+    away_prob = 1 / away_odds
+    total_prob = home_prob + away_prob + (1 / draw_odds)
+    
+    # Normalize probabilities - each side's opponent strength is the other side's probability
+    home_prob_norm = home_prob / total_prob
+    away_prob_norm = away_prob / total_prob
+    
+    # Map to -10 to +10 scale (0.5 = neutral)
+    home_difficulty = round((away_prob_norm - 0.5) * 20, 1)
+    away_difficulty = round((home_prob_norm - 0.5) * 20, 1)
+    return home_difficulty, away_difficulty
+
 @app.route('/api/import-odds', methods=['POST'])
 def import_odds():
     """
@@ -2447,9 +2799,8 @@ def import_odds():
     Expected format: Date, Time, Home Team, Away Team, Home Odds, Draw Odds, Away Odds
     """
     try:
-        # Import GameweekManager for validation
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
+        # Shared GameweekManager for validation
+        gw_manager = get_gameweek_manager()
         
         # Check if file was uploaded
         if 'file' not in request.files:
@@ -2467,7 +2818,7 @@ def import_odds():
             return jsonify({
                 'success': False, 
                 'error': 'Valid gameweek number required',
-                'suggested_gameweek': gw_manager.get_current_gameweek()
+                'suggested_gameweek': get_request_gameweek()
             }), 400
         
         # Second validation: GameweekManager smart validation
@@ -2478,33 +2829,17 @@ def import_odds():
                 'error': validation_result['message'],
                 'suggestion': validation_result['recommendation'],
                 'suggested_gameweek': validation_result.get('suggested_gameweek'),
-                'current_gameweek': gw_manager.get_current_gameweek()
+                'current_gameweek': get_request_gameweek()
             }), 400
         
         # Use validated gameweek
         gameweek = gameweek_input
             
-        # Team name mapping dictionary
-        ODDS_TO_FANTRAX = {
-            "Arsenal": "ARS", "Aston Villa": "AVL", "Bournemouth": "BOU",
-            "Brentford": "BRF", "Brighton": "BHA", "Burnley": "BUR", 
-            "Chelsea": "CHE", "Crystal Palace": "CRY", "Everton": "EVE",
-            "Fulham": "FUL", "Leeds": "LEE", "Liverpool": "LIV",
-            "Manchester City": "MCI", "Manchester Utd": "MUN", "Newcastle": "NEW",
-            "Nottingham": "NOT", "Sunderland": "SUN", "Tottenham": "TOT",
-            "West Ham": "WHU", "Wolves": "WOL",
-            # OddsPortal variations for missing teams
-            "Man City": "MCI", "Man United": "MUN", "Tottenham Hotspur": "TOT",
-            "West Ham United": "WHU", "Wolverhampton": "WOL", "Brighton & Hove Albion": "BHA",
-            "Nottm Forest": "NOT", "Nottingham Forest": "NOT", "Leeds United": "LEE"
-        }
-        
         # Parse CSV content
-        import csv, io
-        from datetime import datetime
-        
-        csv_content = file.read().decode('utf-8')
-        csv_reader = csv.reader(io.StringIO(csv_content))
+        # Stream rows from the upload rather than decoding it into one string first.
+        # skipinitialspace lets the csv module dequote ' "Arsenal"' style cells itself,
+        # so each cell only needs its trailing whitespace stripped below
+        csv_reader = csv.reader(io.TextIOWrapper(file.stream, encoding='utf-8', newline=''), skipinitialspace=True)
         
         # Skip header row
         next(csv_reader, None)
@@ -2517,46 +2852,45 @@ def import_odds():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Clear existing odds for this gameweek
-        cursor.execute("DELETE FROM fixture_odds WHERE gameweek = %s", [gameweek])
-        cursor.execute("DELETE FROM team_fixtures WHERE gameweek = %s", [gameweek])
+        # Clear existing odds for this gameweek (both tables in one statement)
+        cursor.execute("""
+            WITH cleared_odds AS (DELETE FROM fixture_odds WHERE gameweek = %s)
+            DELETE FROM team_fixtures WHERE gameweek = %s
+        """, [gameweek, gameweek])
         
         # First pass: collect all valid matches with dates
         all_matches = []
         teams_seen_this_gw = set()  # Track teams for current gameweek only
         
-        for row in csv_reader:
-            if len(row) < 7:
-                continue
-                
-            # Auto-detect CSV format
-            date_str = row[0].strip().strip('"')
-            
-            # Check if row[2] is a separator (new format) or team name (old format)
-            potential_separator = row[2].strip().strip('"')
-            is_new_format = potential_separator in [':', '–', '-', 'vs']
-            
-            if is_new_format:
-                # New format: Date, Home, Separator, Away, Odds...
-                home_team = row[1].strip().strip('"')
-                away_team = row[3].strip().strip('"')
-                odds_start_index = 4
-            else:
-                # Old format: Date, Time, Home, Away, Odds...
-                home_team = row[2].strip().strip('"')
-                away_team = row[3].strip().strip('"')
-                odds_start_index = 4
+        # Auto-detect CSV format once from the first complete row - a file is never mixed.
+        # row[2] is a separator in the new format and the home team name in the old one
+        rows = (row for row in csv_reader if len(row) >= 7)
+        first_row = next(rows, None)
+        if first_row is not None:
+            rows = chain((first_row,), rows)
+        if first_row is not None and first_row[2].strip() in ODDS_FORMAT_SEPARATORS:
+            # New format: Date, Home, Separator, Away, Odds...
+            home_index = 1
+        else:
+            # Old format: Date, Time, Home, Away, Odds...
+            home_index = 2
+        
+        for row in rows:
+            date_str = row[0].strip()
+            home_team = row[home_index].strip()
+            away_team = row[3].strip()
             
             # Skip if we've already seen both teams for current gameweek
-            team_pair = tuple(sorted([home_team, away_team]))
+            team_pair = (home_team, away_team) if home_team <= away_team else (away_team, home_team)
             if team_pair in teams_seen_this_gw:
                 continue
                 
+            # float() ignores surrounding whitespace itself, and rows are already known to have 7 cells
             try:
-                home_odds = float(row[odds_start_index].strip().strip('"'))
-                draw_odds = float(row[odds_start_index + 1].strip().strip('"'))
-                away_odds = float(row[odds_start_index + 2].strip().strip('"'))
-            except (ValueError, IndexError):
+                home_odds = float(row[4])
+                draw_odds = float(row[5])
+                away_odds = float(row[6])
+            except ValueError:
                 skipped_matches += 1
                 continue
                 
@@ -2577,15 +2911,10 @@ def import_odds():
                 if date_str.startswith('Today'):
                     match_date = datetime.now().date()
                 else:
-                    # Try parsing "22 Aug 2025" format
-                    match_date = datetime.strptime(date_str, '%d %b %Y').date()
+                    match_date = parse_odds_date(date_str)
             except ValueError:
-                try:
-                    # Try alternative formats if needed
-                    match_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    skipped_matches += 1
-                    continue
+                skipped_matches += 1
+                continue
                     
             # Map team names to codes
             home_code = ODDS_TO_FANTRAX.get(home_team)
@@ -2599,7 +2928,7 @@ def import_odds():
                 skipped_matches += 1
                 continue
             
-            print(f"VALID: '{home_team}' vs '{away_team}' -> {home_code} vs {away_code} on {match_date}")
+            logger.debug("VALID: '%s' vs '%s' -> %s vs %s on %s", home_team, away_team, home_code, away_code, match_date)
             
             # Store match data for filtering
             all_matches.append({
@@ -2613,12 +2942,9 @@ def import_odds():
                 'away_odds': away_odds
             })
         
-        # Second pass: take the first 10 matches chronologically (Premier League gameweek = 10 matches)
-        # Sort matches by date (earliest first)
-        all_matches.sort(key=lambda x: x['date'])
-        
-        # Take exactly the first 10 matches
-        filtered_matches = all_matches[:10]
+        # Second pass: take the first 10 matches chronologically (Premier League gameweek = 10 matches).
+        # nsmallest keeps file order for same-day matches, exactly like a stable sort + slice
+        filtered_matches = heapq.nsmallest(10, all_matches, key=lambda x: x['date'])
         
         # Get teams from filtered matches  
         teams_processed = set()
@@ -2626,126 +2952,94 @@ def import_odds():
             teams_processed.add(match['home_code'])
             teams_processed.add(match['away_code'])
         
-        # Third pass: process the filtered matches
+        # Third pass: build the rows for the filtered matches, then write each table in one statement.
+        # Keyed like the ON CONFLICT targets so a later match for the same team/pair wins, as the
+        # per-match upserts did, and no batched upsert touches the same row twice.
+        odds_rows = {}
+        fixture_rows = {}
         for match in filtered_matches:
             try:
-                cursor.execute("""
-                    INSERT INTO fixture_odds 
-                    (gameweek, match_date, home_team, away_team, home_odds, draw_odds, away_odds)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (gameweek, home_team, away_team) DO UPDATE SET
-                        match_date = EXCLUDED.match_date,
-                        home_odds = EXCLUDED.home_odds,
-                        draw_odds = EXCLUDED.draw_odds,
-                        away_odds = EXCLUDED.away_odds
-                """, [gameweek, match['date'], match['home_code'], match['away_code'], match['home_odds'], match['draw_odds'], match['away_odds']])
-                
-                # Calculate difficulty scores
-                def calculate_difficulty_score(home_odds, away_odds, is_home_team):
-                    # Calculate implied probabilities (simplified - not accounting for overround)
-                    home_prob = 1 / match['home_odds']
-                    away_prob = 1 / match['away_odds']
-                    total_prob = home_prob + away_prob + (1/match['draw_odds'])
-                    
-                    # Normalize probabilities
-                    home_prob_norm = home_prob / total_prob
-                    away_prob_norm = away_prob / total_prob
-                    
-                    # Get opponent strength
-                    opponent_strength = away_prob_norm if is_home_team else home_prob_norm
-                    
-                    # Map to -10 to +10 scale (0.5 = neutral)
-                    difficulty_score = (opponent_strength - 0.5) * 20
-                    return round(difficulty_score, 1)
-                
-                home_difficulty = calculate_difficulty_score(match['home_odds'], match['away_odds'], True)
-                away_difficulty = calculate_difficulty_score(match['home_odds'], match['away_odds'], False)
-                
-                # Insert fixture difficulty data
-                cursor.execute("""
-                    INSERT INTO team_fixtures 
-                    (gameweek, team_code, opponent_code, is_home, difficulty_score)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (gameweek, team_code) DO UPDATE SET
-                        opponent_code = EXCLUDED.opponent_code,
-                        is_home = EXCLUDED.is_home,
-                        difficulty_score = EXCLUDED.difficulty_score
-                """, [gameweek, match['home_code'], match['away_code'], True, home_difficulty])
-                
-                cursor.execute("""
-                    INSERT INTO team_fixtures 
-                    (gameweek, team_code, opponent_code, is_home, difficulty_score)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (gameweek, team_code) DO UPDATE SET
-                        opponent_code = EXCLUDED.opponent_code,
-                        is_home = EXCLUDED.is_home,
-                        difficulty_score = EXCLUDED.difficulty_score
-                """, [gameweek, match['away_code'], match['home_code'], False, away_difficulty])
-                
-                # NEW: Capture raw fixture snapshots for trend analysis
-                cursor.execute("""
-                    INSERT INTO raw_fixture_snapshots 
-                    (gameweek, team, opponent, is_home, home_odds, draw_odds, away_odds, 
-                     difficulty_score, odds_source, import_timestamp)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                    ON CONFLICT (gameweek, team)
-                    DO UPDATE SET 
-                        opponent = EXCLUDED.opponent,
-                        is_home = EXCLUDED.is_home,
-                        home_odds = EXCLUDED.home_odds,
-                        draw_odds = EXCLUDED.draw_odds,
-                        away_odds = EXCLUDED.away_odds,
-                        difficulty_score = EXCLUDED.difficulty_score,
-                        import_timestamp = NOW()
-                """, [gameweek, match['home_code'], match['away_code'], True, match['home_odds'], match['draw_odds'], match['away_odds'], home_difficulty, 'oddsportal'])
-                
-                cursor.execute("""
-                    INSERT INTO raw_fixture_snapshots 
-                    (gameweek, team, opponent, is_home, home_odds, draw_odds, away_odds, 
-                     difficulty_score, odds_source, import_timestamp)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                    ON CONFLICT (gameweek, team)
-                    DO UPDATE SET 
-                        opponent = EXCLUDED.opponent,
-                        is_home = EXCLUDED.is_home,
-                        home_odds = EXCLUDED.home_odds,
-                        draw_odds = EXCLUDED.draw_odds,
-                        away_odds = EXCLUDED.away_odds,
-                        difficulty_score = EXCLUDED.difficulty_score,
-                        import_timestamp = NOW()
-                """, [gameweek, match['away_code'], match['home_code'], False, match['home_odds'], match['draw_odds'], match['away_odds'], away_difficulty, 'oddsportal'])
-                
-                # Update player snapshots with home/away status, opponent, and fixture difficulty
-                cursor.execute("""
-                    UPDATE raw_player_snapshots 
-                    SET opponent = %s, is_home = %s, fixture_difficulty = %s, odds_import = TRUE
-                    WHERE gameweek = %s AND team = %s
-                """, [match['away_code'], True, home_difficulty, gameweek, match['home_code']])
-                
-                cursor.execute("""
-                    UPDATE raw_player_snapshots 
-                    SET opponent = %s, is_home = %s, fixture_difficulty = %s, odds_import = TRUE
-                    WHERE gameweek = %s AND team = %s
-                """, [match['home_code'], False, away_difficulty, gameweek, match['away_code']])
-                
-                processed_matches += 1
-                
+                home_difficulty, away_difficulty = calculate_difficulty_scores(
+                    match['home_odds'], match['draw_odds'], match['away_odds'])
             except Exception as e:
                 print(f"Error processing match {match['home_team']} vs {match['away_team']}: {e}")
                 skipped_matches += 1
                 continue
+            
+            odds_rows[(match['home_code'], match['away_code'])] = (
+                gameweek, match['date'], match['home_code'], match['away_code'],
+                match['home_odds'], match['draw_odds'], match['away_odds'])
+            
+            # (team, opponent, is_home, difficulty) for both sides of the fixture
+            fixture_rows[match['home_code']] = (match['home_code'], match['away_code'], True, home_difficulty, match)
+            fixture_rows[match['away_code']] = (match['away_code'], match['home_code'], False, away_difficulty, match)
+            
+            processed_matches += 1
+        
+        if odds_rows:
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO fixture_odds 
+                (gameweek, match_date, home_team, away_team, home_odds, draw_odds, away_odds)
+                VALUES %s
+                ON CONFLICT (gameweek, home_team, away_team) DO UPDATE SET
+                    match_date = EXCLUDED.match_date,
+                    home_odds = EXCLUDED.home_odds,
+                    draw_odds = EXCLUDED.draw_odds,
+                    away_odds = EXCLUDED.away_odds
+            """, list(odds_rows.values()), page_size=100)
+        
+        if fixture_rows:
+            # Insert fixture difficulty data
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO team_fixtures 
+                (gameweek, team_code, opponent_code, is_home, difficulty_score)
+                VALUES %s
+                ON CONFLICT (gameweek, team_code) DO UPDATE SET
+                    opponent_code = EXCLUDED.opponent_code,
+                    is_home = EXCLUDED.is_home,
+                    difficulty_score = EXCLUDED.difficulty_score
+            """, [(gameweek, team, opponent, is_home, difficulty)
+                  for team, opponent, is_home, difficulty, match in fixture_rows.values()], page_size=100)
+            
+            # NEW: Capture raw fixture snapshots for trend analysis
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO raw_fixture_snapshots 
+                (gameweek, team, opponent, is_home, home_odds, draw_odds, away_odds, 
+                 difficulty_score, odds_source, import_timestamp)
+                VALUES %s
+                ON CONFLICT (gameweek, team)
+                DO UPDATE SET 
+                    opponent = EXCLUDED.opponent,
+                    is_home = EXCLUDED.is_home,
+                    home_odds = EXCLUDED.home_odds,
+                    draw_odds = EXCLUDED.draw_odds,
+                    away_odds = EXCLUDED.away_odds,
+                    difficulty_score = EXCLUDED.difficulty_score,
+                    import_timestamp = NOW()
+            """, [(gameweek, team, opponent, is_home, match['home_odds'], match['draw_odds'], match['away_odds'], difficulty, 'oddsportal')
+                  for team, opponent, is_home, difficulty, match in fixture_rows.values()],
+                template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())", page_size=100)
+            
+            # Update player snapshots with home/away status, opponent, and fixture difficulty
+            psycopg2.extras.execute_values(cursor, """
+                UPDATE raw_player_snapshots rps
+                SET opponent = v.opponent, is_home = v.is_home, fixture_difficulty = v.difficulty, odds_import = TRUE
+                FROM (VALUES %s) AS v(gameweek, team, opponent, is_home, difficulty)
+                WHERE rps.gameweek = v.gameweek AND rps.team = v.team
+            """, [(gameweek, team, opponent, is_home, difficulty)
+                  for team, opponent, is_home, difficulty, match in fixture_rows.values()],
+                template="(%s, %s, %s, %s, %s::numeric)", page_size=100)
                 
         # Commit all changes
         conn.commit()
         cursor.close()
-        conn.close()
+        release_db_connection(conn)
         
         # Debug logging
-        print(f"\n=== ODDS IMPORT DEBUG (GW{gameweek}) ===")
-        print(f"Total valid matches found: {len(all_matches)}")
-        print(f"Matches after filtering: {len(filtered_matches)}")
-        print(f"Teams processed: {len(teams_processed)}")
-        print("Teams in filtered matches:", sorted(teams_processed))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("ODDS IMPORT (GW%s): %d valid matches, %d after filtering, %d teams processed: %s",
+                         gameweek, len(all_matches), len(filtered_matches), len(teams_processed),
+                         sorted(teams_processed))
         
         # Calculate filtering stats
         total_valid_matches = len(all_matches)
@@ -2799,34 +3093,78 @@ def get_monitoring_metrics():
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
-        # Get overall mapping statistics
+        # Overall, per-source, confidence-range and match-type statistics in a single scan of name_mappings
         cursor.execute("""
             SELECT 
+                source_system,
+                confidence_range,
+                match_type,
+                GROUPING(source_system) as all_sources,
+                GROUPING(confidence_range) as all_ranges,
+                GROUPING(match_type) as all_types,
                 COUNT(*) as total_mappings,
                 COUNT(*) FILTER (WHERE verified = true) as verified_mappings,
                 COUNT(*) FILTER (WHERE verified = false) as unverified_mappings,
                 AVG(confidence_score) as avg_confidence,
                 COUNT(DISTINCT source_system) as source_systems,
-                SUM(usage_count) as total_usage
-            FROM name_mappings
-        """)
-        overall_stats = dict(cursor.fetchone())
-        
-        # Get statistics by source system
-        cursor.execute("""
-            SELECT 
-                source_system,
-                COUNT(*) as total_mappings,
-                COUNT(*) FILTER (WHERE verified = true) as verified,
-                AVG(confidence_score) as avg_confidence,
-                SUM(usage_count) as usage_count,
+                SUM(usage_count) as total_usage,
                 COUNT(*) FILTER (WHERE confidence_score >= 90) as high_confidence,
                 COUNT(*) FILTER (WHERE confidence_score < 50) as low_confidence
-            FROM name_mappings
-            GROUP BY source_system
-            ORDER BY total_mappings DESC
+            FROM (
+                SELECT 
+                    source_system, match_type, verified, confidence_score, usage_count,
+                    CASE 
+                        WHEN confidence_score >= 95 THEN '95-100%'
+                        WHEN confidence_score >= 85 THEN '85-94%'
+                        WHEN confidence_score >= 70 THEN '70-84%'
+                        WHEN confidence_score >= 50 THEN '50-69%'
+                        ELSE '<50%'
+                    END as confidence_range
+                FROM name_mappings
+            ) nm
+            GROUP BY GROUPING SETS ((), (source_system), (confidence_range), (match_type))
         """)
-        source_system_stats = [dict(row) for row in cursor.fetchall()]
+        
+        overall_stats = {}
+        source_system_stats = []
+        confidence_distribution = []
+        match_type_stats = []
+        for row in cursor.fetchall():
+            if row['all_sources'] and row['all_ranges'] and row['all_types']:
+                overall_stats = {
+                    'total_mappings': row['total_mappings'],
+                    'verified_mappings': row['verified_mappings'],
+                    'unverified_mappings': row['unverified_mappings'],
+                    'avg_confidence': row['avg_confidence'],
+                    'source_systems': row['source_systems'],
+                    'total_usage': row['total_usage']
+                }
+            elif not row['all_sources']:
+                source_system_stats.append({
+                    'source_system': row['source_system'],
+                    'total_mappings': row['total_mappings'],
+                    'verified': row['verified_mappings'],
+                    'avg_confidence': row['avg_confidence'],
+                    'usage_count': row['total_usage'],
+                    'high_confidence': row['high_confidence'],
+                    'low_confidence': row['low_confidence']
+                })
+            elif not row['all_ranges']:
+                confidence_distribution.append({
+                    'confidence_range': row['confidence_range'],
+                    'count': row['total_mappings']
+                })
+            else:
+                match_type_stats.append({
+                    'match_type': row['match_type'],
+                    'count': row['total_mappings'],
+                    'avg_confidence': row['avg_confidence']
+                })
+        
+        # Largest groups first
+        source_system_stats.sort(key=lambda stats: stats['total_mappings'], reverse=True)
+        confidence_distribution.sort(key=lambda stats: stats['count'], reverse=True)
+        match_type_stats.sort(key=lambda stats: stats['count'], reverse=True)
         
         # Get recent mapping activity (last 7 days)
         cursor.execute("""
@@ -2841,30 +3179,6 @@ def get_monitoring_metrics():
         """)
         recent_activity = [dict(row) for row in cursor.fetchall()]
         
-        # Get match quality distribution
-        cursor.execute("""
-            SELECT 
-                CASE 
-                    WHEN confidence_score >= 95 THEN '95-100%'
-                    WHEN confidence_score >= 85 THEN '85-94%'
-                    WHEN confidence_score >= 70 THEN '70-84%'
-                    WHEN confidence_score >= 50 THEN '50-69%'
-                    ELSE '<50%'
-                END as confidence_range,
-                COUNT(*) as count
-            FROM name_mappings
-            GROUP BY 
-                CASE 
-                    WHEN confidence_score >= 95 THEN '95-100%'
-                    WHEN confidence_score >= 85 THEN '85-94%'
-                    WHEN confidence_score >= 70 THEN '70-84%'
-                    WHEN confidence_score >= 50 THEN '50-69%'
-                    ELSE '<50%'
-                END
-            ORDER BY count DESC
-        """)
-        confidence_distribution = [dict(row) for row in cursor.fetchall()]
-        
         # Get top performers (most used mappings)
         cursor.execute("""
             SELECT 
@@ -2896,19 +3210,7 @@ def get_monitoring_metrics():
         """)
         problem_mappings = [dict(row) for row in cursor.fetchall()]
         
-        # Get match type distribution
-        cursor.execute("""
-            SELECT 
-                match_type,
-                COUNT(*) as count,
-                AVG(confidence_score) as avg_confidence
-            FROM name_mappings
-            GROUP BY match_type
-            ORDER BY count DESC
-        """)
-        match_type_stats = [dict(row) for row in cursor.fetchall()]
-        
-        conn.close()
+        release_db_connection(conn)
         
         # Calculate derived metrics
         verification_rate = (overall_stats['verified_mappings'] / overall_stats['total_mappings'] * 100) if overall_stats['total_mappings'] > 0 else 0
@@ -2926,8 +3228,8 @@ def get_monitoring_metrics():
             'problem_mappings': problem_mappings,
             'match_type_distribution': match_type_stats,
             'health_indicators': {
-                'high_confidence_rate': (sum(1 for s in source_system_stats for _ in range(s['high_confidence'])) / overall_stats['total_mappings'] * 100) if overall_stats['total_mappings'] > 0 else 0,
-                'low_confidence_rate': (sum(1 for s in source_system_stats for _ in range(s['low_confidence'])) / overall_stats['total_mappings'] * 100) if overall_stats['total_mappings'] > 0 else 0,
+                'high_confidence_rate': (sum(s['high_confidence'] for s in source_system_stats) / overall_stats['total_mappings'] * 100) if overall_stats['total_mappings'] > 0 else 0,
+                'low_confidence_rate': (sum(s['low_confidence'] for s in source_system_stats) / overall_stats['total_mappings'] * 100) if overall_stats['total_mappings'] > 0 else 0,
                 'avg_confidence': round(overall_stats['avg_confidence'], 2) if overall_stats['avg_confidence'] else 0
             }
         })
@@ -2942,6 +3244,42 @@ def get_monitoring_metrics():
 # UNDERSTAT INTEGRATION API
 # ===============================
 
+# Unmatched players from the last sync, shared by the validation UI endpoints
+UNDERSTAT_UNMATCHED_PATH = os.path.join(os.path.dirname(__file__), '..', 'temp', 'understat_unmatched.json')
+UNDERSTAT_UNMATCHED_CACHE_KEY = 'understat_unmatched'
+UNDERSTAT_UNMATCHED_TTL = 3600  # Data is only used while less than 1 hour old
+
+def save_understat_unmatched(validation_data: Dict):
+    """Persist unmatched sync data to the temp file and keep a parsed copy in the app cache"""
+    os.makedirs(os.path.dirname(UNDERSTAT_UNMATCHED_PATH), exist_ok=True)
+    with open(UNDERSTAT_UNMATCHED_PATH, 'w') as f:
+        json.dump(validation_data, f)
+    cache.set(UNDERSTAT_UNMATCHED_CACHE_KEY, validation_data, timeout=UNDERSTAT_UNMATCHED_TTL)
+
+def load_understat_unmatched() -> Optional[Dict]:
+    """Load unmatched sync data from the app cache, falling back to the temp file (None if neither exists)"""
+    saved_data = cache.get(UNDERSTAT_UNMATCHED_CACHE_KEY)
+    if saved_data is not None:
+        return saved_data
+    
+    try:
+        with open(UNDERSTAT_UNMATCHED_PATH, 'r') as f:
+            saved_data = json.load(f)
+    except FileNotFoundError:
+        return None
+    
+    # Re-populate the cache for the rest of the data's lifetime (e.g. after cache.clear())
+    remaining = int(UNDERSTAT_UNMATCHED_TTL - (time.time() - saved_data['timestamp']))
+    if remaining > 0:
+        cache.set(UNDERSTAT_UNMATCHED_CACHE_KEY, saved_data, timeout=remaining)
+    return saved_data
+
+def clear_understat_unmatched():
+    """Drop the saved unmatched sync data once it has been applied"""
+    cache.delete(UNDERSTAT_UNMATCHED_CACHE_KEY)
+    if os.path.exists(UNDERSTAT_UNMATCHED_PATH):
+        os.remove(UNDERSTAT_UNMATCHED_PATH)
+
 @app.route('/api/understat/sync', methods=['POST'])
 def sync_understat_data():
     """Sync Understat data with database using Global Name Matching System"""
@@ -2960,33 +3298,45 @@ def sync_understat_data():
         if understat_df.empty:
             return jsonify({'error': 'No Understat data available'}), 500
         
+        # Round the per-90 stats once, column-wise, rather than per matched player
+        per90_columns = ['xG90', 'xA90', 'xGI90']
+        understat_df[per90_columns] = understat_df[per90_columns].round(3)
+        
         # Use Global Name Matching System for improved matching
-        matcher = UnifiedNameMatcher(DB_CONFIG)
-        matched_players = []
+        matcher = get_name_matcher()
+        # Update rows for high-confidence matches, keyed by Fantrax ID so a later match for the
+        # same player wins (as the per-player UPDATEs did) and no batched UPDATE touches a row twice
+        understat_rows = {}
+        matched_count = 0
         unmatched_players = []
         
-        for idx, player in understat_df.iterrows():
-            player_name = player.get('player_name', '')
-            team = player.get('team', '')
-            
-            # Try to match using Global Name Matching System
-            match_result = matcher.match_player(
-                source_name=player_name,
-                source_system='understat',
-                team=team,
-                position=None  # Understat doesn't always have reliable position data
-            )
-            
+        # Match every player in one pass - existing mappings and the player universe are
+        # loaded once by match_players_bulk instead of queried per row, and names without a
+        # mapping (suggestion queries, mapping saves) are resolved on a few threads
+        understat_players = understat_df.to_dict('records')
+        match_results = matcher.match_players_bulk([
+            {
+                'name': player.get('player_name', ''),
+                'team': player.get('team', ''),
+                'position': None  # Understat doesn't always have reliable position data
+            }
+            for player in understat_players
+        ], source_system='understat', max_workers=8)
+        
+        # to_dict('records') already produced one fresh dict per row, so unmatched rows are extended in place
+        for player_dict, match_result in zip(understat_players, match_results):
             if match_result['fantrax_id'] is not None and match_result['confidence'] >= 70:
-                # High confidence match - add to matched list
-                player_dict = player.to_dict()
-                player_dict['fantrax_id'] = match_result['fantrax_id']
-                player_dict['fantrax_name'] = match_result['fantrax_name']
-                player_dict['confidence'] = match_result['confidence']
-                matched_players.append(player_dict)
+                # High confidence match - only the stat columns are needed for the update
+                understat_rows[match_result['fantrax_id']] = (
+                    match_result['fantrax_id'],
+                    player_dict['minutes'],
+                    player_dict['xG90'],
+                    player_dict['xA90'],
+                    player_dict['xGI90']
+                )
+                matched_count += 1
             else:
                 # Low confidence or no match - add to unmatched list for manual review
-                player_dict = player.to_dict()
                 player_dict['suggestions'] = match_result.get('suggested_matches', [])
                 player_dict['needs_review'] = match_result.get('needs_review', True)
                 player_dict['confidence'] = match_result.get('confidence', 0)
@@ -2996,72 +3346,55 @@ def sync_understat_data():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        updated_count = 0
-        for player in matched_players:
-            cursor.execute("""
-                UPDATE players 
-                SET minutes = %s, xg90 = %s, xa90 = %s, xgi90 = %s,
+        # Update players and (NEW) raw snapshots for all existing gameweeks with xG data and
+        # minutes in one statement instead of two per player
+        psycopg2.extras.execute_values(cursor, """
+            WITH v(player_id, minutes, xg90, xa90, xgi90) AS (VALUES %s),
+            updated_players AS (
+                UPDATE players p
+                SET minutes = v.minutes, xg90 = v.xg90, xa90 = v.xa90, xgi90 = v.xgi90,
                     last_understat_update = CURRENT_TIMESTAMP
-                WHERE id = %s
-            """, [
-                player['minutes'], 
-                round(player['xG90'], 3),
-                round(player['xA90'], 3), 
-                round(player['xGI90'], 3),
-                player['fantrax_id']
-            ])
-            
-            # NEW: Update raw snapshots with xG data and minutes for all existing gameweeks
-            cursor.execute("""
-                UPDATE raw_player_snapshots 
-                SET minutes_played = %s, xg90 = %s, xa90 = %s, xgi90 = %s, 
-                    understat_import = TRUE, import_timestamp = NOW()
-                WHERE player_id = %s
-            """, [
-                player['minutes'],
-                round(player['xG90'], 3),
-                round(player['xA90'], 3),
-                round(player['xGI90'], 3),
-                player['fantrax_id']
-            ])
-            
-            updated_count += 1
+                FROM v
+                WHERE p.id = v.player_id
+            )
+            UPDATE raw_player_snapshots rps
+            SET minutes_played = v.minutes, xg90 = v.xg90, xa90 = v.xa90, xgi90 = v.xgi90,
+                understat_import = TRUE, import_timestamp = NOW()
+            FROM v
+            WHERE rps.player_id = v.player_id
+        """, list(understat_rows.values()), template="(%s, %s::int, %s::float8, %s::float8, %s::float8)", page_size=1000)
+        updated_count = matched_count
         
         conn.commit()
-        conn.close()
+        release_db_connection(conn)
         
         # Store unmatched players for validation UI (if any)
         if unmatched_players:
             # Save unmatched data to session or temporary storage for validation
-            import json
-            import os
             validation_data = {
                 'source_system': 'understat',
                 'unmatched_players': unmatched_players,
                 'timestamp': time.time()
             }
             
-            # Save to temporary file for validation UI to access
-            temp_dir = os.path.join(os.path.dirname(__file__), '..', 'temp')
-            os.makedirs(temp_dir, exist_ok=True)
-            with open(os.path.join(temp_dir, 'understat_unmatched.json'), 'w') as f:
-                json.dump(validation_data, f)
+            # Save to temporary file (and the app cache) for validation UI to access
+            save_understat_unmatched(validation_data)
         
         # Calculate match rate
-        total_players = len(matched_players) + len(unmatched_players)
-        match_rate = (len(matched_players) / total_players * 100) if total_players > 0 else 0
+        total_players = matched_count + len(unmatched_players)
+        match_rate = (matched_count / total_players * 100) if total_players > 0 else 0
         
         # Update config
         system_params = load_system_parameters()
         system_params['xgi_integration']['last_sync'] = time.time()
-        system_params['xgi_integration']['matched_players'] = len(matched_players)
+        system_params['xgi_integration']['matched_players'] = matched_count
         system_params['xgi_integration']['unmatched_players'] = len(unmatched_players)
         save_system_parameters(system_params)
         
         response_data = {
             'success': True,
             'total_understat_players': total_players,
-            'successfully_matched': len(matched_players),
+            'successfully_matched': matched_count,
             'unmatched_players': len(unmatched_players),
             'match_rate': match_rate,
             'players_updated': updated_count
@@ -3081,27 +3414,61 @@ def sync_understat_data():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Understat team name mapping to database team codes (2025-26 Premier League season)
+UNDERSTAT_TEAM_MAPPING = {
+    'Arsenal': 'ARS',
+    'Aston Villa': 'AVL',
+    'Bournemouth': 'BOU', 
+    'Brentford': 'BRF',  # Database uses BRF, not BRE
+    'Brighton': 'BHA',
+    'Brighton and Hove Albion': 'BHA',  # Alternative name
+    'Burnley': 'BUR',
+    'Chelsea': 'CHE',
+    'Crystal Palace': 'CRY',
+    'Everton': 'EVE',
+    'Fulham': 'FUL',
+    'Leeds United': 'LEE',
+    'Liverpool': 'LIV',
+    'Manchester City': 'MCI',
+    'Manchester United': 'MUN', 
+    'Newcastle United': 'NEW',
+    'Nottingham Forest': 'NOT',  # Database uses NOT, not NFO
+    'Sunderland': 'SUN',
+    'Tottenham': 'TOT',
+    'Tottenham Hotspur': 'TOT',  # Alternative name
+    'West Ham United': 'WHU',
+    'Wolverhampton Wanderers': 'WOL'
+}
+
+# Current Premier League teams only (2025-26 season) - all 20 teams
+CURRENT_PL_TEAMS = frozenset((
+    'ARS', 'AVL', 'BOU', 'BRF', 'BHA', 'BUR', 'CHE', 'CRY', 
+    'EVE', 'FUL', 'LEE', 'LIV', 'MCI', 'MUN', 'NEW', 'NOT', 
+    'SUN', 'TOT', 'WHU', 'WOL'
+))
+
+# Known data corruption patterns in Understat source
+UNDERSTAT_CORRUPTED_ASSIGNMENTS = {
+    # Fulham vs Wolves match has reversed team assignments
+    'Fulham': 'Wolverhampton Wanderers',
+    'Wolverhampton Wanderers': 'Fulham',
+}
+
+# Database team code -> Understat team name (for the validation UI's team dropdown)
+UNDERSTAT_REVERSE_TEAM_MAPPING = {v: k for k, v in UNDERSTAT_TEAM_MAPPING.items()}
+
 @app.route('/api/understat/get-unmatched-data', methods=['GET'])
 def get_understat_unmatched_data():
     """Load saved unmatched Understat players for validation UI"""
     try:
-        import os
-        import json
-        
-        # Check if unmatched data file exists
-        temp_dir = os.path.join(os.path.dirname(__file__), '..', 'temp')
-        unmatched_file = os.path.join(temp_dir, 'understat_unmatched.json')
-        
-        if not os.path.exists(unmatched_file):
+        # Load the saved unmatched data
+        saved_data = load_understat_unmatched()
+        if saved_data is None:
             return jsonify({
                 'status': 'error',
                 'message': 'No unmatched Understat data found. Please sync Understat data first.'
             }), 404
         
-        # Load the saved unmatched data
-        with open(unmatched_file, 'r') as f:
-            saved_data = json.load(f)
-        
         # Check data age (only use if less than 1 hour old)
         data_age_hours = (time.time() - saved_data['timestamp']) / 3600
         if data_age_hours > 1:
@@ -3114,99 +3481,64 @@ def get_understat_unmatched_data():
         unmatched_players = saved_data['unmatched_players']
         needs_review_count = len(unmatched_players)
         
-        # Understat team name mapping to database team codes (2025-26 Premier League season)
-        understat_team_mapping = {
-            'Arsenal': 'ARS',
-            'Aston Villa': 'AVL',
-            'Bournemouth': 'BOU', 
-            'Brentford': 'BRF',  # Database uses BRF, not BRE
-            'Brighton': 'BHA',
-            'Brighton and Hove Albion': 'BHA',  # Alternative name
-            'Burnley': 'BUR',
-            'Chelsea': 'CHE',
-            'Crystal Palace': 'CRY',
-            'Everton': 'EVE',
-            'Fulham': 'FUL',
-            'Leeds United': 'LEE',
-            'Liverpool': 'LIV',
-            'Manchester City': 'MCI',
-            'Manchester United': 'MUN', 
-            'Newcastle United': 'NEW',
-            'Nottingham Forest': 'NOT',  # Database uses NOT, not NFO
-            'Sunderland': 'SUN',
-            'Tottenham': 'TOT',
-            'Tottenham Hotspur': 'TOT',  # Alternative name
-            'West Ham United': 'WHU',
-            'Wolverhampton Wanderers': 'WOL'
-        }
-        
-        # Current Premier League teams only (2025-26 season) - all 20 teams
-        current_pl_teams = {
-            'ARS', 'AVL', 'BOU', 'BRF', 'BHA', 'BUR', 'CHE', 'CRY', 
-            'EVE', 'FUL', 'LEE', 'LIV', 'MCI', 'MUN', 'NEW', 'NOT', 
-            'SUN', 'TOT', 'WHU', 'WOL'
-        }
-        
-        # Known data corruption patterns in Understat source
-        KNOWN_CORRUPTED_ASSIGNMENTS = {
-            # Fulham vs Wolves match has reversed team assignments
-            'Fulham': 'Wolverhampton Wanderers',
-            'Wolverhampton Wanderers': 'Fulham',
-        }
+        # Load every player's name and team once, rather than running up to two LIKE
+        # queries (each on its own connection) for every unmatched player
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT name, team FROM players WHERE name IS NOT NULL")
+                db_players = [(name.lower(), name, team) for name, team in cursor.fetchall()]
+        finally:
+            release_db_connection(conn)
+        
+        # Exact (case-insensitive) names resolve with one dict lookup; team-restricted
+        # lookups only scan that team's squad
+        players_by_lower_name = {}
+        players_by_team = defaultdict(list)
+        for db_player in db_players:
+            players_by_lower_name.setdefault(db_player[0], db_player)
+            players_by_team[db_player[2]].append(db_player)
+        
+        def find_db_player(player_name, team_code=None):
+            """In-memory version of the fuzzy LIKE lookup: either name contains the other (case-insensitive)"""
+            lower_name = player_name.lower()
+            exact = players_by_lower_name.get(lower_name)
+            if exact and (team_code is None or exact[2] == team_code):
+                return exact[1], exact[2]
+            
+            for db_lower, db_name, db_team in (db_players if team_code is None else players_by_team.get(team_code, ())):
+                if lower_name in db_lower or db_lower in lower_name:
+                    return db_name, db_team
+            return None
         
         # Team validation for known Understat data issues
         def validate_and_correct_team(player_name, understat_team):
             """Check if player's team assignment matches our database and correct if needed"""
             
             # Step 1: Check for known corruption patterns first
-            if understat_team in KNOWN_CORRUPTED_ASSIGNMENTS:
-                potential_correct_team = KNOWN_CORRUPTED_ASSIGNMENTS[understat_team]
+            if understat_team in UNDERSTAT_CORRUPTED_ASSIGNMENTS:
+                potential_correct_team = UNDERSTAT_CORRUPTED_ASSIGNMENTS[understat_team]
                 print(f"Corruption check: {player_name} claims {understat_team}, checking if actually {potential_correct_team}")
                 
                 # Verify if player actually belongs to the "swapped" team
-                with get_db_connection() as conn:
-                    with conn.cursor() as cursor:
-                        correct_team_code = understat_team_mapping.get(potential_correct_team, potential_correct_team)
-                        cursor.execute("""
-                            SELECT name, team FROM players 
-                            WHERE team = %s AND (
-                                LOWER(name) LIKE LOWER(%s) 
-                                OR LOWER(name) LIKE LOWER(%s)
-                                OR LOWER(%s) LIKE LOWER(CONCAT('%%', name, '%%'))
-                            )
-                            LIMIT 1
-                        """, (correct_team_code, f'%{player_name}%', f'{player_name}%', player_name))
-                        result = cursor.fetchone()
-                        
-                        if result:
-                            print(f"CORRUPTION DETECTED: {player_name} actually plays for {potential_correct_team}, not {understat_team}")
-                            return potential_correct_team, understat_team_mapping.get(potential_correct_team, potential_correct_team)
+                correct_team_code = UNDERSTAT_TEAM_MAPPING.get(potential_correct_team, potential_correct_team)
+                if find_db_player(player_name, correct_team_code):
+                    print(f"CORRUPTION DETECTED: {player_name} actually plays for {potential_correct_team}, not {understat_team}")
+                    return potential_correct_team, correct_team_code
             
-            # Step 2: Standard database lookup for other cases
-            with get_db_connection() as conn:
-                with conn.cursor() as cursor:
-                    # Use fuzzy matching for name
-                    cursor.execute("""
-                        SELECT name, team FROM players 
-                        WHERE LOWER(name) LIKE LOWER(%s) 
-                        OR LOWER(name) LIKE LOWER(%s)
-                        OR LOWER(%s) LIKE LOWER(CONCAT('%%', name, '%%'))
-                        LIMIT 1
-                    """, (f'%{player_name}%', f'{player_name}%', player_name))
-                    result = cursor.fetchone()
-                    
-                    if result:
-                        db_name, actual_team = result
-                        mapped_understat_team = understat_team_mapping.get(understat_team, understat_team)
-                        
-                        if actual_team != mapped_understat_team:
-                            print(f"Team mismatch: {player_name} - Understat says {understat_team} ({mapped_understat_team}) but DB has {actual_team}")
-                            # Return the correct team name for the dropdown
-                            reverse_mapping = {v: k for k, v in understat_team_mapping.items()}
-                            correct_understat_name = reverse_mapping.get(actual_team, actual_team)
-                            return correct_understat_name, actual_team
-                    
-            return understat_team, understat_team_mapping.get(understat_team, understat_team)
+            # Step 2: Standard lookup for other cases, using fuzzy matching for name
+            result = find_db_player(player_name)
+            if result:
+                db_name, actual_team = result
+                mapped_understat_team = UNDERSTAT_TEAM_MAPPING.get(understat_team, understat_team)
+                
+                if actual_team != mapped_understat_team:
+                    print(f"Team mismatch: {player_name} - Understat says {understat_team} ({mapped_understat_team}) but DB has {actual_team}")
+                    # Return the correct team name for the dropdown
+                    correct_understat_name = UNDERSTAT_REVERSE_TEAM_MAPPING.get(actual_team, actual_team)
+                    return correct_understat_name, actual_team
+            
+            return understat_team, UNDERSTAT_TEAM_MAPPING.get(understat_team, understat_team)
 
         # Format players for validation UI
         formatted_players = []
@@ -3222,7 +3554,7 @@ def get_understat_unmatched_data():
             corrected_understat_team, db_team = validate_and_correct_team(player_name, understat_team)
             
             # Skip players from teams not in current Premier League
-            if db_team not in current_pl_teams:
+            if db_team not in CURRENT_PL_TEAMS:
                 print(f"Skipping {player_name} from {understat_team} - not in current Premier League")
                 continue
             
@@ -3256,7 +3588,8 @@ def get_understat_unmatched_data():
             'match_rate': 0.0
         }
         
-        return jsonify({
+        # Every entry carries the full original Understat row, so serialize with orjson
+        return fast_json({
             'status': 'success',
             'data': {
                 'total_players': saved_data.get('total_players', needs_review_count),
@@ -3294,11 +3627,10 @@ def get_unmatched_understat():
         matched_df, unmatched_df = integrator.match_fantrax_names(understat_df)
         
         # Add suggestions for unmatched
-        unmatched_with_suggestions = []
-        for idx, player in unmatched_df.iterrows():
-            player_dict = player.to_dict()
-            player_dict['suggestions'] = player.get('suggested_matches', [])
-            unmatched_with_suggestions.append(player_dict)
+        # One records conversion instead of a Series plus a dict copy per row
+        unmatched_with_suggestions = unmatched_df.to_dict('records')
+        for player_dict in unmatched_with_suggestions:
+            player_dict['suggestions'] = player_dict.get('suggested_matches', [])
         
         return jsonify({
             'players': unmatched_with_suggestions,
@@ -3339,7 +3671,7 @@ def get_understat_stats():
         
         top_players = [dict(row) for row in cursor.fetchall()]
         
-        conn.close()
+        release_db_connection(conn)
         
         system_params = load_system_parameters()
         xgi_config = system_params.get('xgi_integration', {})
@@ -3399,13 +3731,10 @@ def apply_understat_mappings():
             })
         
         # Load the saved unmatched data
-        temp_file = os.path.join('temp', 'understat_unmatched.json')
-        if not os.path.exists(temp_file):
+        saved_data = load_understat_unmatched()
+        if saved_data is None:
             return jsonify({'error': 'No unmatched Understat data found. Please sync again.'}), 404
         
-        with open(temp_file, 'r') as f:
-            saved_data = json.load(f)
-        
         # Check data age (must be < 1 hour old)
         data_age_minutes = (time.time() - saved_data['timestamp']) / 60
         if data_age_minutes > 60:
@@ -3429,8 +3758,13 @@ def apply_understat_mappings():
         conn.commit()
         print("Created/verified understat_name_mappings table")
         
-        updated_players = []
+        # Index the saved Understat rows by name once instead of scanning them per mapping
+        understat_by_name = {}
+        for player in saved_data['unmatched_players']:  # Correct key: unmatched_players
+            understat_by_name.setdefault(player['player_name'], player)  # Correct field: player_name
         
+        # Resolve every confirmed mapping first, then write each table in one batched statement
+        resolved_mappings = []
         for original_name, mapping in confirmed_mappings.items():
             fantrax_id = mapping.get('fantrax_id')
             fantrax_name = mapping.get('fantrax_name')
@@ -3440,69 +3774,71 @@ def apply_understat_mappings():
                 continue
             
             # Find the original Understat data for this player
-            understat_player = None
-            for player in saved_data['unmatched_players']:  # Correct key: unmatched_players
-                if player['player_name'] == original_name:  # Correct field: player_name
-                    understat_player = player
-                    break
-            
+            understat_player = understat_by_name.get(original_name)
             if not understat_player:
                 print(f"Warning: Could not find Understat data for {original_name}")
                 continue
             
-            if not dry_run:
-                try:
-                    # Update the database with Understat stats
-                    update_query = """
-                        UPDATE players 
-                        SET xg90 = %s, xa90 = %s, xgi90 = %s, minutes = %s,
-                            last_understat_update = %s
-                        WHERE id = %s
-                    """
-                    
-                    cursor.execute(update_query, (
-                        understat_player.get('xG90', 0),  # Correct case: xG90
-                        understat_player.get('xA90', 0),   # Correct case: xA90
-                        understat_player.get('xGI90', 0),  # Correct case: xGI90
-                        understat_player.get('minutes', 0),
-                        datetime.now(),
-                        fantrax_id  # Correct: fantrax_id value goes to 'id' column
-                    ))
-                    
-                    if cursor.rowcount == 0:
-                        print(f"Warning: No player found with id={fantrax_id} for {original_name}")
-                        continue
-                    
-                except Exception as e:
-                    print(f"Database error updating {original_name}: {e}")
-                    continue
-                
-                # Add to understat_name_mappings for backwards compatibility
-                understat_mapping_query = """
-                    INSERT INTO understat_name_mappings (understat_name, fantrax_id, confidence, created_at)
-                    VALUES (%s, %s, %s, %s)
-                    ON CONFLICT (understat_name) DO UPDATE SET
-                        fantrax_id = EXCLUDED.fantrax_id,
-                        confidence = EXCLUDED.confidence,
-                        updated_at = %s
-                """
-                
-                cursor.execute(understat_mapping_query, (
-                    original_name,
-                    fantrax_id,
-                    mapping.get('confidence', 100.0),
-                    datetime.now(),
-                    datetime.now()
-                ))
-                
-                # ALSO add to Global Name Matching System for cross-source benefits
-                global_mapping_query = """
+            resolved_mappings.append((original_name, mapping, understat_player))
+        
+        if not dry_run and resolved_mappings:
+            now = datetime.now()
+            
+            # Update the database with Understat stats. Keyed by Fantrax ID so a later mapping
+            # to the same player wins, as the per-mapping UPDATEs did
+            player_rows = {
+                mapping['fantrax_id']: (
+                    mapping['fantrax_id'],                # Correct: fantrax_id value goes to 'id' column
+                    understat_player.get('xG90', 0),      # Correct case: xG90
+                    understat_player.get('xA90', 0),      # Correct case: xA90
+                    understat_player.get('xGI90', 0),     # Correct case: xGI90
+                    understat_player.get('minutes', 0),
+                    now
+                )
+                for original_name, mapping, understat_player in resolved_mappings
+            }
+            updated_ids = {row['id'] for row in psycopg2.extras.execute_values(cursor, """
+                UPDATE players p
+                SET xg90 = v.xg90, xa90 = v.xa90, xgi90 = v.xgi90, minutes = v.minutes,
+                    last_understat_update = v.updated_at
+                FROM (VALUES %s) AS v(id, xg90, xa90, xgi90, minutes, updated_at)
+                WHERE p.id = v.id
+                RETURNING p.id
+            """, list(player_rows.values()),
+                template="(%s, %s::float8, %s::float8, %s::float8, %s::int, %s::timestamp)",
+                page_size=500, fetch=True)}
+            
+            # Mappings are only recorded for players that actually exist
+            for original_name, mapping, understat_player in resolved_mappings:
+                if mapping['fantrax_id'] not in updated_ids:
+                    print(f"Warning: No player found with id={mapping['fantrax_id']} for {original_name}")
+            resolved_mappings = [entry for entry in resolved_mappings if entry[1]['fantrax_id'] in updated_ids]
+        
+        if not dry_run and resolved_mappings:
+            # Add to understat_name_mappings for backwards compatibility
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO understat_name_mappings (understat_name, fantrax_id, confidence, created_at)
+                VALUES %s
+                ON CONFLICT (understat_name) DO UPDATE SET
+                    fantrax_id = EXCLUDED.fantrax_id,
+                    confidence = EXCLUDED.confidence,
+                    updated_at = EXCLUDED.created_at
+            """, [
+                (original_name, mapping['fantrax_id'], mapping.get('confidence', 100.0), now)
+                for original_name, mapping, understat_player in resolved_mappings
+            ], page_size=500)
+            
+            # ALSO add to Global Name Matching System for cross-source benefits. A savepoint lets a
+            # failure here roll back on its own instead of aborting the whole import at commit time
+            cursor.execute("SAVEPOINT global_mappings")
+            try:
+                psycopg2.extras.execute_values(cursor, """
                     INSERT INTO name_mappings (
                         source_system, source_name, fantrax_id, fantrax_name, 
                         confidence_score, match_type, verified, verification_date, 
                         verified_by, last_used, usage_count
                     )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    VALUES %s
                     ON CONFLICT (source_system, source_name) DO UPDATE SET
                         fantrax_id = EXCLUDED.fantrax_id,
                         fantrax_name = EXCLUDED.fantrax_name,
@@ -3514,42 +3850,35 @@ def apply_understat_mappings():
                         last_used = EXCLUDED.last_used,
                         usage_count = EXCLUDED.usage_count + 1,
                         updated_at = CURRENT_TIMESTAMP
-                """
-                
-                try:
-                    cursor.execute(global_mapping_query, (
-                        'understat',                         # source_system
-                        original_name,                       # source_name  
-                        fantrax_id,                         # fantrax_id
-                        fantrax_name,                       # fantrax_name
-                        mapping.get('confidence', 100.0),   # confidence_score
-                        'manual',                           # match_type
-                        True,                               # verified
-                        datetime.now(),                     # verification_date
-                        'user_manual_import',               # verified_by
-                        datetime.now(),                     # last_used
-                        1                                   # usage_count
-                    ))
-                    print(f"Added {original_name} → {fantrax_name} to Global Name Matching System")
-                except Exception as e:
-                    print(f"Warning: Could not add to Global Name Matching System: {e}")
-                    # Continue - understat_name_mappings still worked
-            
-            updated_players.append({
-                'understat_name': original_name,
-                'fantrax_name': fantrax_name,
-                'fantrax_id': fantrax_id,
-                'xGI90': understat_player.get('xGI90', 0)  # Correct case: xGI90
-            })
+                """, [
+                    ('understat', original_name, mapping['fantrax_id'], mapping['fantrax_name'],
+                     mapping.get('confidence', 100.0), 'manual', True, now, 'user_manual_import', now, 1)
+                    for original_name, mapping, understat_player in resolved_mappings
+                ], page_size=500)
+                cursor.execute("RELEASE SAVEPOINT global_mappings")
+                print(f"Added {len(resolved_mappings)} Understat mappings to Global Name Matching System")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT global_mappings")
+                print(f"Warning: Could not add to Global Name Matching System: {e}")
+                # Continue - understat_name_mappings still worked
+        
+        updated_players = [{
+            'understat_name': original_name,
+            'fantrax_name': mapping['fantrax_name'],
+            'fantrax_id': mapping['fantrax_id'],
+            'xGI90': understat_player.get('xGI90', 0)  # Correct case: xGI90
+        } for original_name, mapping, understat_player in resolved_mappings]
         
         if not dry_run:
             conn.commit()
             
+            # Mappings were written straight to name_mappings - drop stale matcher results
+            _name_matcher.clear_cache()
+            
             # Clean up the temp file after successful import
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            clear_understat_unmatched()
         
-        conn.close()
+        release_db_connection(conn)
         
         return jsonify({
             'status': 'success',
@@ -3569,52 +3898,47 @@ def apply_understat_mappings():
             'debug': True
         }), 500
 
-def parse_formation_csv(lines, cursor):
+# Team name mapping from CSV (full names) to database (abbreviations)
+# Based on TEAM_CODE_MAPPING.md 
+FORMATION_TEAM_MAPPING = {
+    'arsenal': 'ARS',
+    'aston villa': 'AVL', 
+    'bournemouth': 'BOU',
+    'brentford': 'BRF',  # Using BRF as per current database
+    'brighton and hove albion': 'BHA',
+    'brighton & hove albion': 'BHA',
+    'burnley': 'BUR',
+    'chelsea': 'CHE',
+    'crystal palace': 'CRY',
+    'everton': 'EVE',
+    'fulham': 'FUL',
+    'leeds united': 'LEE',
+    'liverpool': 'LIV',
+    'manchester city': 'MCI',
+    'manchester united': 'MUN',
+    'newcastle united': 'NEW',
+    'nottingham forest': 'NOT',  # Using NOT as per current database
+    'sunderland': 'SUN',
+    'tottenham hotspur': 'TOT',
+    'west ham united': 'WHU',
+    'wolverhampton wanderers': 'WOL'
+}
+
+def parse_formation_csv(rows, cursor):
     """
     Parse formation matrix CSV format from FFS scraping.
+    Takes an iterable of already-split CSV rows (header excluded).
     Returns list of player dictionaries with position constraint checking.
     """
-    import csv
-    from io import StringIO
-    
-    # Team name mapping from CSV (full names) to database (abbreviations)
-    # Based on TEAM_CODE_MAPPING.md 
-    team_name_mapping = {
-        'arsenal': 'ARS',
-        'aston villa': 'AVL', 
-        'bournemouth': 'BOU',
-        'brentford': 'BRF',  # Using BRF as per current database
-        'brighton and hove albion': 'BHA',
-        'brighton & hove albion': 'BHA',
-        'burnley': 'BUR',
-        'chelsea': 'CHE',
-        'crystal palace': 'CRY',
-        'everton': 'EVE',
-        'fulham': 'FUL',
-        'leeds united': 'LEE',
-        'liverpool': 'LIV',
-        'manchester city': 'MCI',
-        'manchester united': 'MUN',
-        'newcastle united': 'NEW',
-        'nottingham forest': 'NOT',  # Using NOT as per current database
-        'sunderland': 'SUN',
-        'tottenham hotspur': 'TOT',
-        'west ham united': 'WHU',
-        'wolverhampton wanderers': 'WOL'
-    }
-    
     players_to_process = []
     
-    for line in lines:
-        if not line.strip():
+    for line_data in rows:
+        if not any(field.strip() for field in line_data):
             continue
-        # Use CSV reader to properly handle quotes
-        csv_reader = csv.reader(StringIO(line))
-        line_data = next(csv_reader)
         team_raw = line_data[0].strip().strip('"')
         
         # Map team name from full name to database abbreviation
-        team = team_name_mapping.get(team_raw.lower(), team_raw)
+        team = FORMATION_TEAM_MAPPING.get(team_raw.lower(), team_raw)
         
         # Process each formation position (skip team column)
         for pos_idx, player_name in enumerate(line_data[1:12], 1):  # Positions 1-11
@@ -3670,22 +3994,17 @@ def parse_formation_csv(lines, cursor):
     
     return players_to_process
 
-def parse_individual_csv(lines):
+def parse_individual_csv(rows):
     """
     Parse individual player CSV format (original format).
+    Takes an iterable of already-split CSV rows (header excluded).
     Returns list of player dictionaries.
     """
-    import csv
-    from io import StringIO
-    
     players_to_process = []
     
-    for line in lines:
-        if not line.strip():
+    for line_data in rows:
+        if not any(field.strip() for field in line_data):
             continue
-        # Use CSV reader to properly handle quotes
-        csv_reader = csv.reader(StringIO(line))
-        line_data = next(csv_reader)
         if len(line_data) < 4:
             continue
             
@@ -3750,14 +4069,11 @@ def calculate_values_v2():
     Supports both v2.0 and legacy v1.0 for comparison
     """
     try:
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        
         data = request.get_json() or {}
         formula_version = data.get('formula_version', 'v2.0')
         
         # Use GameweekManager for consistent gameweek detection
-        gameweek = data.get('gameweek', gw_manager.get_current_gameweek())
+        gameweek = data.get('gameweek', get_request_gameweek())
         compare_versions = data.get('compare_versions', False)
         
         # Load current parameters
@@ -3813,13 +4129,10 @@ def calculate_values_v2():
         """, [gameweek, gameweek])
         
         players = cursor.fetchall()
-        conn.close()
+        release_db_connection(conn)
         
-        # Calculate values for all players
-        results = []
-        for player in players:
-            calculation = engine.calculate_player_value(dict(player))
-            results.append(calculation)
+        # Calculate values for all players (RealDictCursor rows are already dicts)
+        results = [engine.calculate_player_value(player) for player in players]
         
         # V2.0 calculations only - no version comparisons needed
         
@@ -3857,9 +4170,7 @@ def store_v2_calculations(calculations: List[Dict], version: str, gameweek: int
     try:
         # Use GameweekManager if no gameweek specified
         if gameweek is None:
-            from src.gameweek_manager import GameweekManager
-            gw_manager = GameweekManager()
-            gameweek = gw_manager.get_current_gameweek()
+            gameweek = get_request_gameweek()
             
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -3908,14 +4219,14 @@ def store_v2_calculations(calculations: List[Dict], version: str, gameweek: int
             ])
         
         conn.commit()
-        conn.close()
+        release_db_connection(conn)
         print(f"[SUCCESS] Stored {len(calculations)} calculations for {version}")
         
     except Exception as e:
         print(f"[ERROR] Error storing v2.0 calculations: {e}")
         if conn:
             conn.rollback()
-            conn.close()
+            release_db_connection(conn)
 
 
 @app.route('/api/verify-ppg', methods=['GET'])
@@ -3926,9 +4237,7 @@ def verify_ppg():
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
         # Get current gameweek
-        from src.gameweek_manager import GameweekManager
-        gw_manager = GameweekManager()
-        gameweek = gw_manager.get_current_gameweek()
+        gameweek = get_request_gameweek()
         
         cursor.execute("""
             SELECT 
@@ -3965,7 +4274,7 @@ def verify_ppg():
         total_players = len(results)
         discrepancies = len([r for r in results if r['difference'] > 0.1])
         
-        conn.close()
+        release_db_connection(conn)
         
         return jsonify({
             'gameweek': gameweek,
@@ -4083,9 +4392,7 @@ def optimize_parameters_endpoint():
         
         # Use GameweekManager to provide intelligent default range
         if 'gameweek_range' not in data:
-            from src.gameweek_manager import GameweekManager
-            gw_manager = GameweekManager()
-            current_gw = gw_manager.get_current_gameweek()
+            current_gw = get_request_gameweek()
             # Default to analyzing from GW1 to current gameweek (minimum 3 gameweeks for analysis)
             end_gw = max(3, current_gw)
             default_range = [1, end_gw]
@@ -4136,9 +4443,7 @@ def benchmark_versions_endpoint():
         
         # Use GameweekManager to provide intelligent default range
         if 'gameweek_range' not in data:
-            from src.gameweek_manager import GameweekManager
-            gw_manager = GameweekManager()
-            current_gw = gw_manager.get_current_gameweek()
+            current_gw = get_request_gameweek()
             # Default to analyzing from GW1 to current gameweek (minimum 3 gameweeks for analysis)
             end_gw = max(3, current_gw)
             default_range = [1, end_gw]
@@ -4187,7 +4492,7 @@ def validation_history_endpoint():
         """)
         
         results = cursor.fetchall()
-        conn.close()
+        release_db_connection(conn)
         
         # Convert to JSON-serializable format
         history = []
@@ -4244,7 +4549,7 @@ if __name__ == '__main__':
         print(f"Database connected: {player_count} players loaded")
         
         cursor.close()
-        conn.close()
+        release_db_connection(conn)
     except Exception as e:
         print(f"Database connection failed: {e}")
         print("Starting app anyway...")
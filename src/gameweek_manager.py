@@ -50,6 +50,11 @@ class GameweekManager:
         self._cache_timestamp = 0
         self._cache_duration = 30  # seconds
     
+    def clear_cache(self) -> None:
+        """Drop the cached current gameweek (call after imports that add gameweek data)."""
+        self._cache_current_gw = None
+        self._cache_timestamp = 0
+    
     def get_db_connection(self) -> psycopg2.extensions.connection:
         """Get database connection using configured parameters."""
         return psycopg2.connect(**self.db_config)
@@ -7,13 +7,31 @@ import unicodedata
 import re
 import html
 from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 
+# Compiled once at import; normalize_name runs for both sides of every comparison
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _similarity_ratio(a: str, b: str, min_ratio: float) -> float:
+    """
+    SequenceMatcher ratio of a and b, or 0.0 when it cannot reach min_ratio.
+    real_quick_ratio() (lengths only) and quick_ratio() (character counts) are
+    cheap upper bounds on ratio(), so most non-matching candidates are rejected
+    without the full O(n*m) sequence comparison.
+    """
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < min_ratio or matcher.quick_ratio() < min_ratio:
+        return 0.0
+    return matcher.ratio()
+
 
 class MatchingStrategies:
     """Collection of name matching strategies with confidence scoring"""
     
     @staticmethod
+    @lru_cache(maxsize=8192)
     def normalize_name(name: str) -> str:
         """
         Normalize name for better matching:
@@ -38,7 +56,7 @@ class MatchingStrategies:
         ascii_name = ascii_name.replace("ß", "ss")
         
         # Clean up spaces and convert to lowercase
-        ascii_name = re.sub(r'\s+', ' ', ascii_name.strip().lower())
+        ascii_name = _WHITESPACE_RE.sub(' ', ascii_name.strip().lower())
         
         return ascii_name
     
@@ -134,8 +152,8 @@ class MatchingStrategies:
         if not norm_source or not norm_target:
             return False, 0.0
         
-        # Calculate similarity ratio
-        similarity = SequenceMatcher(None, norm_source, norm_target).ratio()
+        # Calculate similarity ratio (skipped when it cannot reach the threshold below)
+        similarity = _similarity_ratio(norm_source, norm_target, 0.75)
         confidence = similarity * 100
         
         # Only consider it a match if similarity is above threshold
@@ -172,7 +190,7 @@ class MatchingStrategies:
             return True, 70.0
         
         # Check for fuzzy last name match
-        similarity = SequenceMatcher(None, source_last, target_last).ratio()
+        similarity = _similarity_ratio(source_last, target_last, 0.85)
         if similarity >= 0.85:
             confidence = 60.0 + (similarity - 0.85) * 200  # 60-90% confidence
             return True, min(confidence, 80.0)
@@ -7,6 +7,7 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from .matching_strategies import MatchingStrategies
 from .suggestion_engine import SuggestionEngine
@@ -60,10 +61,15 @@ class UnifiedNameMatcher:
         """
         cache_key = f"{source_system}:{source_name}"
         
-        # Check cache first (unless force refresh)
-        if not force_refresh and cache_key in self.cache:
-            result = self.cache[cache_key].copy()
+        # Check cache first (unless force refresh). Single get: the cache is shared between
+        # request threads and may be cleared at any time
+        cached = None if force_refresh else self.cache.get(cache_key)
+        if cached is not None:
+            result = cached.copy()
             result['from_cache'] = True
+            # The cache outlives requests, so a hit is still a use of the stored mapping
+            if result.get('mapping_id'):
+                self._update_usage_stats(result['mapping_id'])
             return result
         
         # Step 1: Check for existing verified mapping
@@ -77,6 +83,16 @@ class UnifiedNameMatcher:
         # Step 2: Try multi-strategy matching against database
         match_result = self._multi_strategy_match(source_name, team, position)
         
+        result = self._finalize_match(source_name, source_system, team, position, match_result)
+        
+        # Cache the result
+        self.cache[cache_key] = result
+        
+        return result
+    
+    def _finalize_match(self, source_name: str, source_system: str, team: Optional[str],
+                        position: Optional[str], match_result: Dict) -> Dict:
+        """Add suggestions/review flag to a strategy match and persist it if confident enough"""
         # Step 3: Generate suggestions for manual review if needed
         suggestions = []
         if not match_result['fantrax_id'] or match_result['confidence'] < 85.0:
@@ -106,7 +122,7 @@ class UnifiedNameMatcher:
                 'verified': not needs_review  # Auto-verify high confidence matches
             })
         
-        result = {
+        return {
             'fantrax_id': match_result['fantrax_id'],
             'fantrax_name': match_result['fantrax_name'],
             'confidence': match_result['confidence'],
@@ -116,11 +132,127 @@ class UnifiedNameMatcher:
             'mapping_id': mapping_id,
             'from_cache': False
         }
+    
+    def match_players_bulk(self, players: List[Dict], source_system: str,
+                           max_workers: int = 1) -> List[Dict]:
+        """
+        Match many players with shared lookups instead of per-player queries
         
-        # Cache the result
-        self.cache[cache_key] = result
+        Existing mappings for all names and the full player universe are loaded
+        once, candidates are filtered by team/position in memory, and usage
+        statistics are updated in a single statement. Results are identical to
+        calling match_player() for each entry in order.
         
-        return result
+        Args:
+            players: List of player dicts with 'name', 'team', 'position'
+            source_system: Source system identifier
+            max_workers: Threads used to resolve names without an existing mapping
+                (scoring, suggestion lookups and mapping saves are independent per name)
+            
+        Returns:
+            List of matching results (same order as players)
+        """
+        if not players:
+            return []
+        
+        names = list({p.get('name') for p in players if p.get('name')})
+        
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            
+            # Best existing mapping per source name (same ordering as _check_existing_mapping)
+            cursor.execute("""
+                SELECT DISTINCT ON (nm.source_name) nm.*, p.name as current_fantrax_name
+                FROM name_mappings nm
+                LEFT JOIN players p ON nm.fantrax_id = p.id
+                WHERE nm.source_system = %s AND nm.source_name = ANY(%s)
+                ORDER BY nm.source_name, nm.verified DESC, nm.confidence_score DESC
+            """, [source_system, names])
+            existing_mappings = {row['source_name']: dict(row) for row in cursor.fetchall()}
+            
+            cursor.execute("SELECT p.id, p.name, p.team, p.position FROM players p")
+            universe = cursor.fetchall()
+        finally:
+            conn.close()
+        
+        # Candidate lists per (team, position) filter, built lazily
+        candidates_by_filter = {}
+        used_mapping_ids = []
+        # Results produced by this call, by cache key. Results are only ever read back from here:
+        # the shared cache can be cleared or evicted by other threads while names are resolved
+        batch_results = {}
+        # Names that need strategy matching, by cache key (first occurrence wins, as with the cache)
+        pending = {}
+        # Per player: (cache key, served as a cache hit, result already known from the cache)
+        plan = []
+        counted_hits = set()
+        
+        for player_data in players:
+            source_name = player_data.get('name')
+            team = player_data.get('team')
+            position = player_data.get('position')
+            cache_key = f"{source_system}:{source_name}"
+            
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                result = cached.copy()
+                result['from_cache'] = True
+                # The cache outlives requests, so a hit is still a use of the stored mapping
+                # (counted once per name per call, as a per-request cache used to)
+                if result.get('mapping_id') and cache_key not in counted_hits:
+                    counted_hits.add(cache_key)
+                    used_mapping_ids.append(result['mapping_id'])
+                plan.append((cache_key, True, result))
+                continue
+            
+            if cache_key in batch_results or cache_key in pending:
+                plan.append((cache_key, True, None))
+                continue
+            
+            if source_name in existing_mappings:
+                mapping = existing_mappings[source_name]
+                used_mapping_ids.append(mapping['id'])
+                batch_results[cache_key] = self._format_result_from_mapping(mapping)
+            else:
+                filter_key = (team or None, position or None)
+                if filter_key not in candidates_by_filter:
+                    candidates_by_filter[filter_key] = [
+                        c for c in universe
+                        if (not team or c['team'] == team) and (not position or c['position'] == position)
+                    ]
+                pending[cache_key] = (source_name, team, position, candidates_by_filter[filter_key])
+            plan.append((cache_key, False, None))
+        
+        def resolve(pending_match):
+            source_name, team, position, candidates = pending_match
+            match_result = self._score_candidates(source_name, candidates)
+            return self._finalize_match(source_name, source_system, team, position, match_result)
+        
+        if max_workers > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+                resolved = list(executor.map(resolve, pending.values()))
+        else:
+            resolved = [resolve(pending_match) for pending_match in pending.values()]
+        batch_results.update(zip(pending, resolved))
+        
+        # Fill the shared cache as a side effect only (single-key writes)
+        for cache_key, result in batch_results.items():
+            self.cache[cache_key] = result
+        
+        results = []
+        for cache_key, from_cache, result in plan:
+            if result is None:
+                result = batch_results[cache_key]
+                if from_cache:
+                    result = result.copy()
+                    result['from_cache'] = True
+            results.append(result)
+        
+        if used_mapping_ids:
+            self._update_usage_stats_bulk(used_mapping_ids)
+        
+        return results
     
     def _check_existing_mapping(self, source_name: str, source_system: str) -> Optional[Dict]:
         """Check if we already have a mapping for this name/system combination"""
@@ -176,40 +308,44 @@ class UnifiedNameMatcher:
             cursor.execute(base_query, params)
             candidates = cursor.fetchall()
             
-            if not candidates:
-                return {
-                    'fantrax_id': None,
-                    'fantrax_name': None,
-                    'confidence': 0.0,
-                    'match_type': 'no_candidates'
-                }
-            
-            # Apply matching strategies
-            candidate_names = [c['name'] for c in candidates]
-            best_match_name, confidence, strategy = self.strategies.find_best_match(
-                source_name, candidate_names
-            )
-            
-            if best_match_name:
-                # Find the matching candidate details
-                for candidate in candidates:
-                    if candidate['name'] == best_match_name:
-                        return {
-                            'fantrax_id': candidate['id'],
-                            'fantrax_name': candidate['name'],
-                            'confidence': confidence,
-                            'match_type': strategy
-                        }
+            return self._score_candidates(source_name, candidates)
             
+        finally:
+            conn.close()
+    
+    def _score_candidates(self, source_name: str, candidates: List[Dict]) -> Dict:
+        """Run the matching strategies for one source name against pre-filtered candidates"""
+        if not candidates:
             return {
                 'fantrax_id': None,
                 'fantrax_name': None,
                 'confidence': 0.0,
-                'match_type': 'no_match'
+                'match_type': 'no_candidates'
             }
-            
-        finally:
-            conn.close()
+        
+        # Apply matching strategies
+        candidate_names = [c['name'] for c in candidates]
+        best_match_name, confidence, strategy = self.strategies.find_best_match(
+            source_name, candidate_names
+        )
+        
+        if best_match_name:
+            # Find the matching candidate details
+            for candidate in candidates:
+                if candidate['name'] == best_match_name:
+                    return {
+                        'fantrax_id': candidate['id'],
+                        'fantrax_name': candidate['name'],
+                        'confidence': confidence,
+                        'match_type': strategy
+                    }
+        
+        return {
+            'fantrax_id': None,
+            'fantrax_name': None,
+            'confidence': 0.0,
+            'match_type': 'no_match'
+        }
     
     def _save_mapping(self, mapping_data: Dict) -> int:
         """Save a new mapping to the database"""
@@ -288,6 +424,32 @@ class UnifiedNameMatcher:
         finally:
             conn.close()
     
+    def _update_usage_stats_bulk(self, mapping_ids: List[int]):
+        """Update usage statistics for many mappings (repeated ids count once per use)"""
+        conn = psycopg2.connect(**self.db_config)
+        
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                UPDATE name_mappings nm
+                SET usage_count = nm.usage_count + u.uses,
+                    last_used = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM (
+                    SELECT id, COUNT(*) as uses
+                    FROM unnest(%s::int[]) as id
+                    GROUP BY id
+                ) u
+                WHERE nm.id = u.id
+            """
+            
+            cursor.execute(query, [mapping_ids])
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
     def _format_result_from_mapping(self, mapping: Dict) -> Dict:
         """Format a database mapping into a standard result format"""
         return {
@@ -303,7 +465,8 @@ class UnifiedNameMatcher:
     
     def confirm_mapping(self, source_name: str, source_system: str, 
                        fantrax_id: str, user_id: str = 'unknown',
-                       confidence_override: Optional[float] = None) -> bool:
+                       confidence_override: Optional[float] = None,
+                       conn=None) -> Optional[int]:
         """
         Confirm/verify a name mapping manually
         
@@ -313,11 +476,15 @@ class UnifiedNameMatcher:
             fantrax_id: Confirmed Fantrax player ID
             user_id: User who confirmed the mapping
             confidence_override: Override confidence score (optional)
+            conn: Existing connection to use, e.g. borrowed from a pool (optional,
+                  left open for the caller)
             
         Returns:
-            True if successful, False otherwise
+            Mapping ID if successful (truthy), None otherwise
         """
-        conn = psycopg2.connect(**self.db_config)
+        owns_connection = conn is None
+        if owns_connection:
+            conn = psycopg2.connect(**self.db_config)
         
         try:
             cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -328,7 +495,7 @@ class UnifiedNameMatcher:
             
             if not player:
                 self.logger.error(f"Player ID {fantrax_id} not found")
-                return False
+                return None
             
             # Save/update the mapping
             query = """
@@ -353,6 +520,7 @@ class UnifiedNameMatcher:
                     last_used = CURRENT_TIMESTAMP,
                     usage_count = name_mappings.usage_count + 1,
                     updated_at = CURRENT_TIMESTAMP
+                RETURNING id
             """
             
             confidence = confidence_override or 100.0  # Manual confirmations get high confidence
@@ -363,23 +531,23 @@ class UnifiedNameMatcher:
                 True, datetime.now(), user_id, datetime.now(), 1
             ])
             
+            mapping_id = cursor.fetchone()['id']
             conn.commit()
             
             # Clear cache for this mapping
-            cache_key = f"{source_system}:{source_name}"
-            if cache_key in self.cache:
-                del self.cache[cache_key]
+            self.cache.pop(f"{source_system}:{source_name}", None)
             
             self.logger.info(f"Confirmed mapping: {source_name} -> {player['name']} by {user_id}")
             
-            return True
+            return mapping_id
             
         except Exception as e:
             conn.rollback()
             self.logger.error(f"Failed to confirm mapping: {e}")
-            return False
+            return None
         finally:
-            conn.close()
+            if owns_connection:
+                conn.close()
     
     def get_mapping_statistics(self) -> Dict:
         """Get comprehensive statistics about the matching system"""
@@ -396,19 +564,11 @@ class UnifiedNameMatcher:
         Returns:
             List of matching results
         """
-        results = []
+        results = self.match_players_bulk(players, source_system)
         
-        for player_data in players:
-            result = self.match_player(
-                source_name=player_data['name'],
-                source_system=source_system,
-                team=player_data.get('team'),
-                position=player_data.get('position')
-            )
-            
-            # Add original player data to result
+        # Add original player data to result
+        for player_data, result in zip(players, results):
             result['original_data'] = player_data
-            results.append(result)
         
         return results
     
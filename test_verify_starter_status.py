@@ -0,0 +1,82 @@
+"""
+Test Suite for /api/verify-starter-status serialization
+Fantasy Football Value Hunter
+
+starter_multiplier is numeric(4,3), so psycopg2 returns Decimal values.
+The endpoint must send them as JSON numbers, not strings. Runs without a
+database - the connection and prepared statements are mocked.
+"""
+
+import json
+import unittest
+import sys
+import os
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+
+# Add project root and src directory to Python path
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import app as app_module
+
+class TestVerifyStarterStatus(unittest.TestCase):
+    """Decimal starter multipliers serialize as JSON numbers."""
+
+    def setUp(self):
+        """Mock the database so the endpoint runs DB-free."""
+        cursor = MagicMock()
+        cursor.fetchall.side_effect = [
+            # starter_dist
+            [
+                {'starter_multiplier': Decimal('1.000'), 'player_count': 3, 'players': ['A', 'B', 'C']},
+                {'starter_multiplier': Decimal('0.650'), 'player_count': 1, 'players': ['D']},
+            ],
+            # starter_unusual
+            [
+                {'player_name': 'E', 'starter_multiplier': Decimal('0.750'), 'team': 'ARS', 'position': 'M'},
+            ],
+        ]
+        cursor.fetchone.return_value = {'missing_count': 0}
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+
+        self.patches = [
+            patch.object(app_module, 'get_db_connection', return_value=conn),
+            patch.object(app_module, 'release_db_connection'),
+            patch.object(app_module, 'execute_prepared'),
+            patch.object(app_module, 'get_request_gameweek', return_value=5),
+        ]
+        for p in self.patches:
+            p.start()
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        """Remove the database mocks."""
+        for p in self.patches:
+            p.stop()
+
+    def test_decimal_multiplier_is_json_number(self):
+        """Test multipliers come back as numbers in both lists."""
+        response = self.client.get('/api/verify-starter-status')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+
+        distribution = data['multiplier_distribution']
+        self.assertEqual([d['multiplier'] for d in distribution], [1.0, 0.65])
+        self.assertTrue(all(isinstance(d['multiplier'], float) for d in distribution))
+
+        unusual = data['unusual_multipliers']
+        self.assertEqual(unusual[0]['multiplier'], 0.75)
+        self.assertIsInstance(unusual[0]['multiplier'], float)
+
+    def test_statistics_counted_by_multiplier(self):
+        """Test float multipliers still key the override statistics."""
+        response = self.client.get('/api/verify-starter-status')
+        statistics = json.loads(response.data)['statistics']
+        self.assertEqual(statistics['starters'], 3)
+        self.assertEqual(statistics['rotation_risks'], 1)
+        self.assertEqual(statistics['total_players'], 4)
+
+if __name__ == '__main__':
+    unittest.main()